@@ -5,19 +5,200 @@
 import os
 import json
 import time
-import importlib
 import threading
 import inspect
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from automation_executor import AutomationExecutor
+from plugin_registry import PluginRegistry
+from event_sink import configure_default_sink, close_default_sink
+from snapshot_service import configure_default_service, shutdown_default_service
+from clip_recorder import configure_default_recorder
+from trigger_throttle import TriggerThrottle, DEFAULT_THROTTLE
+from plugin_sandbox import PluginSandbox
+from flow_conditions import compile_condition
+from automation_stats import AutomationStats
+from webhook_client import configure_default_client, close_default_client
 
 PLUGIN_DIR = "plugins"
+SETTINGS_PATH = "user_configs/automation.json"
+
+# Executor defaults, overridable in user_configs/automation.json
+DEFAULT_SETTINGS = {
+    "workers": 4,             # Plugin steps that may run at the same time
+    "queue_size": 64,         # Triggers allowed to wait for a worker
+    "overflow_policy": "coalesce", # drop | coalesce | block
+    "max_inflight_steps": 32, # Steps running at once (async steps overlap on one loop)
+    "step_timeout": 30,       # Seconds, default for steps without their own 'timeout'
+    "sandbox": {              # Out-of-process plugin workers (see plugin_sandbox.py)
+        "default": False,     # Run every step isolated unless the step sets 'sandbox'
+        "workers": 2
+    },
+    "event_log": {            # Structured event sink (see event_sink.py)
+        "log_dir": "logs",
+        "jsonl": True,
+        "sqlite": False,
+        "max_mb": 10,
+        "max_hours": 24,
+        "compress": True
+    },
+    "snapshots": {            # Snapshot encode pool (see snapshot_service.py)
+        "save_dir": "snapshots",
+        "fmt": ".jpg",
+        "quality": 90,
+        "max_mb": 2048,
+        "workers": 2
+    },
+    "clips": {                # Pre/post-event ring buffer (see clip_recorder.py)
+        "save_dir": "clips",
+        "seconds": 10,        # Longest 'pre' a flow can ask for
+        "max_mb": 64,         # Memory cap per camera
+        "fps": 15,
+        "quality": 70,
+        "container": "mp4",
+        "disk_mb": 4096       # Clip folder quota, oldest clips are evicted first
+    },
+    "webhooks": {             # HTTP notifications (see webhook_client.py)
+        "url": None,          # Default endpoint for webhook_notify steps without url=
+        "spool_dir": "user_configs/webhook_spool",
+        "batch_window": 1.0,  # Seconds to gather events into one POST
+        "max_batch": 50,
+        "max_retries": 4,
+        "timeout": 5.0,
+        "spool_max_mb": 50
+    }
+}
+
+def _merge_settings(defaults, overrides):
+    """
+    Deep-merges user settings over the defaults, so a file that only sets
+    {"sandbox": {"default": true}} keeps every other sandbox key.
+    """
+    merged = {}
+    for key, value in defaults.items():
+        if isinstance(value, dict):
+            override = overrides.get(key)
+            merged[key] = _merge_settings(value, override if isinstance(override, dict) else {})
+        else:
+            merged[key] = overrides.get(key, value)
+    for key, value in overrides.items():
+        if key not in defaults:
+            merged[key] = value
+    return merged
+
+class _FlowPlan:
+    def __init__(self, flow):
+        """Dependency graph of a flow, built once when the flow is set."""
+        count = len(flow)
+        self.deps = []
+        for index, step in enumerate(flow):
+            after = step.get("after")
+            if after is None:
+                deps = [index - 1] if index > 0 else []
+            else:
+                deps = sorted({int(n) - 1 for n in after if 0 < int(n) <= count and int(n) - 1 != index})
+            self.deps.append(deps)
+
+        if self._has_cycle(count):
+            print("Flow has circular 'after' dependencies; running it as a simple chain.")
+            self.deps = [[index - 1] if index > 0 else [] for index in range(count)]
+
+        self.dependents = [[] for _ in range(count)]
+        for index, deps in enumerate(self.deps):
+            for dep in deps:
+                self.dependents[dep].append(index)
+        self.roots = [index for index, deps in enumerate(self.deps) if not deps]
+
+    def _has_cycle(self, count):
+        # Kahn's algorithm: anything left unvisited sits on a cycle
+        waiting = [len(deps) for deps in self.deps]
+        dependents = [[] for _ in range(count)]
+        for index, deps in enumerate(self.deps):
+            for dep in deps:
+                dependents[dep].append(index)
+        ready = [index for index in range(count) if waiting[index] == 0]
+        visited = 0
+        while ready:
+            index = ready.pop()
+            visited += 1
+            for dependent in dependents[index]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+        return visited != count
+
+class _ChainRun:
+    def __init__(self, model, flow, plan, context, generation):
+        """Progress of one triggered flow through its plan."""
+        self.model = model
+        self.flow = flow
+        self.plan = plan
+        self.context = context
+        self.generation = generation
+        self.created = time.time()
+        self._waiting = [len(deps) for deps in plan.deps]
+        self._remaining = len(flow)
+        self._lock = threading.Lock()
+
+    def complete(self, index):
+        """Returns (steps that just became ready, whether the whole flow is done)."""
+        ready = []
+        with self._lock:
+            self._remaining -= 1
+            for dependent in self.plan.dependents[index]:
+                self._waiting[dependent] -= 1
+                if self._waiting[dependent] == 0:
+                    ready.append(dependent)
+            return ready, self._remaining == 0
 
 class AutomationManager:
     def __init__(self):
-        self.plugins = {}
+        self.plugins = PluginRegistry(PLUGIN_DIR)
         self.active_flows = {} # { model_name: [step_data, step_data...] }
+        self.flow_options = {} # { model_name: {"throttle": {...}} } saved next to the steps
+        self._plans = {}       # { model_name: _FlowPlan } dependency graph of each flow
+        self.stats = AutomationStats() # Dashboard counters (triggers, step and chain latency)
+        self.throttle = TriggerThrottle()
+        self.settings = self._load_settings()
+        self.executor = AutomationExecutor(
+            workers=int(self.settings["workers"]),
+            queue_size=int(self.settings["queue_size"]),
+            overflow=self.settings["overflow_policy"]
+        )
+
+        # Shared event loop for 'async def run' plugins. Sync plugins run on
+        # the loop's default executor so timeouts/cancellation behave the same.
+        self.loop = asyncio.new_event_loop()
+        self._sync_pool = ThreadPoolExecutor(max_workers=int(self.settings["workers"]),
+                                             thread_name_prefix="plugin-sync")
+        self.loop.set_default_executor(self._sync_pool)
+        threading.Thread(target=self.loop.run_forever, name="automation-loop", daemon=True).start()
+        self._step_slots = threading.BoundedSemaphore(int(self.settings["max_inflight_steps"]))
+        self._inflight = set()
+        self._inflight_lock = threading.Lock()
+        # Warm worker processes, started once a flow has an isolated step
+        self.sandbox = PluginSandbox(PLUGIN_DIR, workers=int(self.settings["sandbox"]["workers"]))
+
+        # Shared structured log used by log_detection and other plugins
+        self.event_sink = configure_default_sink(**self.settings["event_log"])
+        self.snapshots = configure_default_service(**self.settings["snapshots"])
+        # Buffering only runs while some flow uses clip_export
+        self.clip_recorder = configure_default_recorder(**self.settings["clips"])
+        self.webhooks = configure_default_client(**self.settings["webhooks"])
+
         self._ensure_plugin_dir()
         self.refresh_plugins()
 
+    def _load_settings(self):
+        settings = _merge_settings(DEFAULT_SETTINGS, {})
+        if os.path.exists(SETTINGS_PATH):
+            try:
+                with open(SETTINGS_PATH, "r") as f:
+                    settings = _merge_settings(DEFAULT_SETTINGS, json.load(f))
+            except Exception as e:
+                print(f"Failed to read automation settings: {e}")
+        return settings
+
     def _ensure_plugin_dir(self):
         if not os.path.exists(PLUGIN_DIR):
             os.makedirs(PLUGIN_DIR)
@@ -59,12 +240,15 @@ class AutomationManager:
                 Saves the current frame to the 'snapshots' directory.
                 Argument: 'prefix=my_name' (optional)
                 """
-                import cv2
-                import os
-                import time
+                from snapshot_service import get_default_service
+
+                # Uses the app's snapshot pool and disk quota: must run in-process, never in a sandbox worker
+                SANDBOX = False
 
                 def run(context, args):
-                    frame = context.get("frame")
+                    frame = context.get("frame_handle")
+                    if frame is None:
+                        frame = context.get("frame")
                     if frame is None:
                         print("[SNAPSHOT] Error: No frame data in context.")
                         return
@@ -76,19 +260,15 @@ class AutomationManager:
                         if len(parts) > 1:
                             prefix = parts[1].split(" ")[0]
 
-                    save_dir = "snapshots"
-                    if not os.path.exists(save_dir):
-                        os.makedirs(save_dir)
-                        
-                    timestamp = time.strftime("%Y%m%d_%H%M%S")
-                    filename = f"{prefix}_{timestamp}.jpg"
-                    filepath = os.path.join(save_dir, filename)
-                    
-                    try:
-                        cv2.imwrite(filepath, frame)
-                        print(f"[SNAPSHOT] Saved: {filepath}")
-                    except Exception as e:
-                        print(f"[SNAPSHOT] Save failed: {e}")
+                    # Encoding and the disk write happen on the snapshot pool, not this step
+                    future = get_default_service().submit(frame, prefix=prefix, timestamp=context.get("timestamp"))
+
+                    def _report(f):
+                        try:
+                            print(f"[SNAPSHOT] Saved: {f.result()}")
+                        except Exception as e:
+                            print(f"[SNAPSHOT] Save failed: {e}")
+                    future.add_done_callback(_report)
                 '''
         }
 
@@ -102,36 +282,76 @@ class AutomationManager:
                     print(f"Created default plugin: {filename}")
 
     def refresh_plugins(self):
-        """Scans the plugins folder for python scripts with a 'run' function."""
-        self.plugins = {}
-        for f in os.listdir(PLUGIN_DIR):
-            if f.endswith(".py") and f != "__init__.py":
-                mod_name = f[:-3]
-                try:
-                    module = importlib.import_module(f"{PLUGIN_DIR}.{mod_name}")
-                    importlib.reload(module) # Ensure fresh code
-                    if hasattr(module, "run"):
-                        # Get docstring for UI description
-                        desc = module.__doc__.strip() if module.__doc__ else "No description."
-                        self.plugins[mod_name] = {"func": module.run, "desc": desc}
-                except Exception as e:
-                    print(f"Failed to load plugin {mod_name}: {e}")
+        """
+        Scans the plugins folder for python scripts with a 'run' function.
+        Only files whose mtime/hash changed are re-read; nothing is imported here.
+        """
+        self.plugins.scan()
 
     def get_available_scripts(self):
-        return list(self.plugins.keys())
+        self.plugins.scan()
+        return self.plugins.names()
 
     def get_flow_for_model(self, model_name):
         return self.active_flows.get(model_name, [])
 
-    def set_flow_for_model(self, model_name, flow_data):
+    def get_flow_options(self, model_name):
+        options = self.flow_options.get(model_name, {})
+        return {"throttle": {**DEFAULT_THROTTLE, **options.get("throttle", {})}}
+
+    def set_flow_for_model(self, model_name, flow_data, options=None):
         """
         flow_data is a list of dicts:
         [
             {"script": "sound_alert", "delay": 0, "args": "volume=100"},
-            {"script": "log_event", "delay": 5, "args": ""}
+            {"script": "log_event", "delay": 5, "args": "", "timeout": 10}
         ]
+        'timeout' (seconds) is optional and falls back to settings["step_timeout"].
+        'sandbox' (bool) is optional and falls back to settings["sandbox"]["default"].
+        'condition' is optional, e.g. "score > 0.8 and between('22:00', '06:00')";
+        the step is skipped (delay included) when it doesn't match.
+        'after' is optional: step numbers (1-based) this step waits for. Without it
+        a step waits for the one before it, so plain lists run as a chain;
+        "after": [] starts the step as soon as the flow is triggered.
+        options: {"throttle": {rate_per_min, burst, per_identity, per_camera, coalesce}}
         """
+        # Compile conditions now so triggers only evaluate them
+        for step in flow_data:
+            condition = compile_condition(step.get("condition"))
+            if condition is not None and condition.error:
+                print(f"Condition for {step.get('script')} is invalid ({condition.error}); step will be skipped.")
+
+        self._plans[model_name] = _FlowPlan(flow_data)
         self.active_flows[model_name] = flow_data
+        if options is not None:
+            self.flow_options[model_name] = options
+            self.throttle.reset(model_name)
+        self._update_clip_buffering()
+        self._update_sandbox()
+
+    def _update_clip_buffering(self):
+        self.clip_recorder.enabled = any(step.get("script") == "clip_export"
+                                         for flow in self.active_flows.values() for step in flow)
+
+    def _is_sandboxed(self, step):
+        if not step.get("sandbox", self.settings["sandbox"]["default"]):
+            return False
+        # Plugins built on the app's singletons (clip buffers, event log, snapshot
+        # pool, webhook client) would get empty, competing copies in a worker
+        return self.plugins.sandbox_safe(step.get("script"))
+
+    def _update_sandbox(self):
+        # Start (and pre-import into) the worker pool before the first trigger needs it
+        self.plugins.scan()
+        isolated = set()
+        for flow in self.active_flows.values():
+            for step in flow:
+                if self._is_sandboxed(step):
+                    isolated.add(step.get("script"))
+                elif step.get("sandbox") and not self.plugins.sandbox_safe(step.get("script")):
+                    print(f"{step.get('script')} uses shared app services; it runs in-process, not isolated.")
+        if isolated:
+            self.sandbox.start(preload=isolated)
 
     def save_flow_preset(self, model_name, preset_name):
         path = f"user_configs/{model_name}/flows"
@@ -139,8 +359,10 @@ class AutomationManager:
             os.makedirs(path)
         
         filepath = os.path.join(path, f"{preset_name}.json")
+        preset = {"steps": self.active_flows.get(model_name, [])}
+        preset.update(self.get_flow_options(model_name))
         with open(filepath, "w") as f:
-            json.dump(self.active_flows.get(model_name, []), f, indent=4)
+            json.dump(preset, f, indent=4)
         return filepath
 
     def load_flow_preset(self, model_name, preset_name):
@@ -148,41 +370,171 @@ class AutomationManager:
         if os.path.exists(path):
             with open(path, "r") as f:
                 data = json.load(f)
-                self.active_flows[model_name] = data
-                return True
+            # Older presets are a bare list of steps
+            if isinstance(data, list):
+                data = {"steps": data}
+            options = {k: v for k, v in data.items() if k != "steps"}
+            self.set_flow_for_model(model_name, data.get("steps", []), options)
+            return True
         return False
 
     def trigger_flow(self, model_name, context_data):
         """
-        Executes the flow associated with the model in a background thread.
+        Queues the flow associated with the model on the automation executor.
         context_data: dict containing {identity, confidence, timestamp, etc}
+        Returns True if the flow was queued, False if there is none or it was throttled.
         """
         flow = self.active_flows.get(model_name)
         if not flow:
-            return
+            return False
+
+        # Token buckets per model / camera / identity (or track ID)
+        camera = context_data.get("camera")
+        identity = context_data.get("track_id", context_data.get("identity"))
+        throttle_cfg = self.flow_options.get(model_name, {}).get("throttle")
+        allowed, folded = self.throttle.check(model_name, camera, identity, throttle_cfg)
+        if not allowed:
+            self.stats.record_trigger("throttled")
+            return False
+        context_data["coalesced"] = folded
 
-        # Run in thread to allow delays without freezing UI
-        threading.Thread(target=self._execute_chain, args=(flow, context_data), daemon=True).start()
+        # Bounded pool: a burst of detections queues (or coalesces per key)
+        # instead of spawning a thread each
+        context_data.setdefault("model", model_name)
+        queued = self.executor.submit(self._execute_chain, flow, self._plans[model_name], context_data,
+                                      self.executor.generation, key=(model_name, camera, identity))
+        self.stats.record_trigger("queued" if queued else "merged")
+        return queued
 
-    def _execute_chain(self, flow, context):
+    def _execute_chain(self, flow, plan, context, generation):
         print(f"--- Starting Automation Chain for {context.get('identity')} ---")
-        
-        for step in flow:
-            script_name = step.get("script")
-            delay = float(step.get("delay", 0))
-            args = step.get("args", "")
+        run = _ChainRun(context.get("model"), flow, plan, context, generation)
+        for index in plan.roots:
+            self._start_step(run, index)
+
+    def _start_step(self, run, index):
+        """Runs step `index` now, or parks it on the timer heap if it has a delay."""
+        if not self.executor.is_current(run.generation):
+            return
+        step = run.flow[index]
 
-            # 1. Handle Delay
-            if delay > 0:
-                time.sleep(delay)
+        # 0. Check the step's condition before waiting for it
+        condition = compile_condition(step.get("condition"))
+        if condition is not None and not condition.evaluate(run.context):
+            self._finish_step(run, index)
+            return
+
+        # 1. Handle Delay (no thread is held while waiting)
+        delay = float(step.get("delay", 0))
+        if delay > 0:
+            self.executor.schedule(delay, self._run_step, run, index)
+        else:
+            self._run_step(run, index)
+
+    def _run_step(self, run, index):
+        if not self.executor.is_current(run.generation):
+            return
+        step = run.flow[index]
+        script_name = step.get("script")
+        args = step.get("args", "")
 
-            # 2. Execute Script
+        # 2. Execute Script
+        if self._is_sandboxed(step):
+            # Imported by the worker process, never in this one
+            plugin = {"sandbox": script_name} if script_name in self.plugins.names() else None
+        else:
             plugin = self.plugins.get(script_name)
-            if plugin:
-                try:
-                    # Pass context + user args
-                    plugin["func"](context, args)
-                except Exception as e:
-                    print(f"Error executing {script_name}: {e}")
-            else:
-                print(f"Script {script_name} not found.")
+        if not plugin:
+            print(f"Script {script_name} not found.")
+            self.stats.record_step(script_name, 0.0, "Script not found")
+            self._finish_step(run, index)
+            return
+
+        timeout = float(step.get("timeout") or self.settings["step_timeout"] or 0)
+        # Blocks this worker (not the loop) when too many steps are in flight,
+        # so bursts back up into the executor queue and its overflow policy
+        self._step_slots.acquire()
+        started = time.monotonic()
+        future = asyncio.run_coroutine_threadsafe(
+            self._run_plugin(plugin, run.context, args, timeout if timeout > 0 else None), self.loop)
+        with self._inflight_lock:
+            self._inflight.add(future)
+        future.add_done_callback(lambda f: self._on_step_done(f, script_name, run, index, started))
+
+    def _finish_step(self, run, index):
+        """Marks a step done (ran, failed or skipped) and releases the steps waiting on it."""
+        ready, finished = run.complete(index)
+        for dependent in ready:
+            self.executor.schedule(0, self._start_step, run, dependent)
+        if finished:
+            # Detection timestamp to last step: what the site actually experiences
+            self.stats.record_chain(run.model, time.time() - run.context.get("timestamp", run.created))
+
+    async def _run_plugin(self, plugin, context, args, timeout):
+        if "sandbox" in plugin:
+            # The sandbox enforces the timeout itself by killing the stuck worker
+            return await asyncio.wrap_future(self.sandbox.submit(plugin["sandbox"], context, args, timeout))
+        if plugin["is_async"]:
+            call = plugin["func"](context, args)
+        else:
+            call = self.loop.run_in_executor(None, plugin["func"], context, args)
+        # A timed-out sync step keeps its pool thread until it returns, but the chain moves on
+        return await asyncio.wait_for(call, timeout)
+
+    def _on_step_done(self, future, script_name, run, index, started):
+        # Runs on the loop thread: keep it short and hand the next step back to the executor
+        with self._inflight_lock:
+            self._inflight.discard(future)
+        self._step_slots.release()
+
+        if future.cancelled():
+            return
+        error = future.exception()
+        timed_out = isinstance(error, (asyncio.TimeoutError, TimeoutError))
+        if timed_out:
+            print(f"Step {script_name} timed out.")
+        elif error is not None:
+            print(f"Error executing {script_name}: {error}")
+        if error is not None:
+            error = "Timed out" if timed_out else f"{type(error).__name__}: {error}"
+        self.stats.record_step(script_name, time.monotonic() - started, error, timed_out)
+
+        # Later steps can see how the previous one went
+        run.context["last_result"] = None if error is not None else future.result()
+        run.context["last_error"] = error
+
+        self._finish_step(run, index)
+
+    def get_stats(self):
+        """Live numbers for the automation dashboard."""
+        stats = self.stats.snapshot()
+        stats["queue_depth"] = self.executor.queue_depth()
+        stats["inflight_steps"] = len(self._inflight)
+        stats["executor"] = self.executor.get_stats()
+        stats["throttled_total"] = self.throttle.throttled
+        stats["sandbox"] = dict(self.sandbox.stats)
+        stats["snapshot_queue"] = self.snapshots.queue_depth()
+        stats["events_dropped"] = self.event_sink.dropped
+        stats["webhooks"] = dict(self.webhooks.stats)
+        return stats
+
+    def cancel_pending(self):
+        """Drops queued triggers and delayed steps and cancels running steps (camera stopped)."""
+        self.executor.cancel_all()
+        with self._inflight_lock:
+            inflight = list(self._inflight)
+        for future in inflight:
+            future.cancel()
+        self.sandbox.cancel_all()
+
+    def shutdown(self):
+        """Stops the executor and the plugin event loop. Call on application exit."""
+        self.cancel_pending()
+        self.executor.shutdown(wait=True)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._sync_pool.shutdown(wait=False)
+        self.sandbox.shutdown()
+        # Flush buffered output last, after steps stopped producing it
+        shutdown_default_service()
+        close_default_client()
+        close_default_sink()
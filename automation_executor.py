@@ -0,0 +1,207 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import time
+import heapq
+import queue
+import threading
+import itertools
+
+OVERFLOW_POLICIES = ("drop", "coalesce", "block")
+
+class _Job:
+    __slots__ = ("func", "args", "key", "generation", "cancelled")
+
+    def __init__(self, func, args, key, generation):
+        self.func = func
+        self.args = args
+        self.key = key
+        self.generation = generation
+        self.cancelled = False
+
+class AutomationExecutor:
+    def __init__(self, workers=4, queue_size=64, overflow="drop", block_timeout=1.0):
+        """
+        Fixed worker pool + one timer-heap scheduler for delayed steps.
+        Replaces a thread per trigger and time.sleep() per delay.
+
+        overflow (what happens when queue_size jobs are already waiting):
+          'drop'     - reject the new job
+          'coalesce' - if a job with the same key is still waiting, update its
+                       arguments instead; else drop. Below the limit every job is queued.
+          'block'    - wait up to block_timeout for space, then drop
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}'. Use one of {OVERFLOW_POLICIES}.")
+
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._pending = {}            # { key: _Job } waiting in the queue (for coalescing)
+        self._pending_lock = threading.Lock()   # Also guards stats and _generation
+
+        self._timers = []             # heap of (due_time, seq, _Job)
+        self._timer_cond = threading.Condition()
+        self._seq = itertools.count()
+
+        self._generation = 0          # Bumped by cancel_all(); stale jobs are skipped
+        self._running = True
+        self.stats = {"submitted": 0, "dropped": 0, "coalesced": 0, "cancelled": 0}
+
+        self._threads = []
+        for i in range(workers):
+            t = threading.Thread(target=self._worker_loop, name=f"automation-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        t = threading.Thread(target=self._scheduler_loop, name="automation-scheduler", daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    # --- SUBMISSION ---
+
+    def submit(self, func, *args, key=None):
+        """
+        Queues func(*args) for a worker. Returns False if the job was dropped
+        (or merged into an already waiting job with the same key).
+        """
+        if not self._running:
+            return False
+        job = _Job(func, args, key, self._generation)
+        return self._enqueue(job)
+
+    def schedule(self, delay, func, *args):
+        """
+        Runs func(*args) on a worker after `delay` seconds, without holding a thread.
+        Never dropped: for steps of an already accepted chain, not for new triggers.
+        """
+        if not self._running:
+            return
+        job = _Job(func, args, None, self._generation)
+        with self._timer_cond:
+            heapq.heappush(self._timers, (time.monotonic() + delay, next(self._seq), job))
+            self._timer_cond.notify()
+
+    def _enqueue(self, job):
+        try:
+            if self.overflow == "block":
+                self._queue.put(job, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(job)
+        except queue.Full:
+            with self._pending_lock:
+                if self.overflow == "coalesce" and job.key is not None:
+                    waiting = self._pending.get(job.key)
+                    if waiting is not None and not waiting.cancelled:
+                        # Latest data wins, no extra queue slot used
+                        waiting.args = job.args
+                        self.stats["coalesced"] += 1
+                        return False
+                self.stats["dropped"] += 1
+            return False
+
+        with self._pending_lock:
+            if job.key is not None:
+                self._pending[job.key] = job
+            self.stats["submitted"] += 1
+        return True
+
+    def _count(self, name, n=1):
+        with self._pending_lock:
+            self.stats[name] += n
+
+    # --- THREADS ---
+
+    def _worker_loop(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            with self._pending_lock:
+                if job.key is not None and self._pending.get(job.key) is job:
+                    del self._pending[job.key]
+                stale = job.cancelled or job.generation != self._generation
+            if stale:
+                self._count("cancelled")
+                continue
+            try:
+                job.func(*job.args)
+            except Exception as e:
+                print(f"[Automation] Job failed: {e}")
+
+    def _scheduler_loop(self):
+        while True:
+            with self._timer_cond:
+                while self._running and (not self._timers or self._timers[0][0] > time.monotonic()):
+                    timeout = self._timers[0][0] - time.monotonic() if self._timers else None
+                    self._timer_cond.wait(timeout)
+                if not self._running:
+                    return
+                _, _, job = heapq.heappop(self._timers)
+
+            if job.generation != self._generation:
+                self._count("cancelled")
+                continue
+            # Delayed steps and chain dependents bypass the overflow policy: the chain
+            # was already accepted, so wait for a slot rather than drop a mid-chain step
+            while True:
+                try:
+                    self._queue.put(job, timeout=self.block_timeout)
+                    break
+                except queue.Full:
+                    if not self._running or job.generation != self._generation:
+                        self._count("cancelled")
+                        break
+
+    # --- LIFECYCLE ---
+
+    def queue_depth(self):
+        """Jobs waiting for a worker plus delayed steps waiting on the timer heap."""
+        with self._timer_cond:
+            delayed = len(self._timers)
+        return self._queue.qsize() + delayed
+
+    def get_stats(self):
+        with self._pending_lock:
+            return dict(self.stats)
+
+    def is_current(self, generation):
+        return generation == self._generation
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def cancel_all(self):
+        """Cancels every queued and delayed job. Jobs already running finish their step."""
+        with self._pending_lock:
+            self._generation += 1
+            self._pending.clear()
+        with self._timer_cond:
+            delayed = len(self._timers)
+            self._timers.clear()
+            self._timer_cond.notify()
+        queued = 0
+        try:
+            while True:
+                job = self._queue.get_nowait()
+                if job is not None:
+                    queued += 1
+        except queue.Empty:
+            pass
+        self._count("cancelled", delayed + queued)
+
+    def shutdown(self, wait=False, timeout=2.0):
+        self.cancel_all()
+        self._running = False
+        with self._timer_cond:
+            self._timer_cond.notify_all()
+        for _ in range(len(self._threads) - 1):
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass
+        if wait:
+            deadline = time.time() + timeout
+            for t in self._threads:
+                t.join(max(0.0, deadline - time.time()))
@@ -0,0 +1,79 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import time
+import threading
+from collections import deque
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class AutomationStats:
+    def __init__(self, window=60, samples=512):
+        """
+        Counters behind the automation dashboard. Recording is O(1) under one lock;
+        percentiles are only computed when snapshot() is called.
+        window: seconds covered by the per-minute rates.
+        samples: latencies kept per plugin / model for percentiles.
+        """
+        self.window = window
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._triggers = {}   # { outcome: deque of monotonic times }
+        self._totals = {}     # { outcome: count since start }
+        self._steps = {}      # { script: {"latency", "runs", "failures", "timeouts", "last_error"} }
+        self._chains = {}     # { model: deque of seconds }
+
+    def record_trigger(self, outcome):
+        """outcome: 'queued', 'throttled' or 'merged' (coalesced into / dropped by the executor)."""
+        now = time.monotonic()
+        with self._lock:
+            times = self._triggers.setdefault(outcome, deque())
+            times.append(now)
+            while times and now - times[0] > self.window:
+                times.popleft()
+            self._totals[outcome] = self._totals.get(outcome, 0) + 1
+
+    def record_step(self, script, seconds, error=None, timed_out=False):
+        with self._lock:
+            entry = self._steps.get(script)
+            if entry is None:
+                entry = {"latency": deque(maxlen=self.samples), "runs": 0, "failures": 0,
+                         "timeouts": 0, "last_error": None, "last_error_at": None}
+                self._steps[script] = entry
+            entry["latency"].append(seconds)
+            entry["runs"] += 1
+            if timed_out:
+                entry["timeouts"] += 1
+            if error is not None:
+                entry["failures"] += 1
+                entry["last_error"] = error
+                entry["last_error_at"] = time.time()
+
+    def record_chain(self, model, seconds):
+        with self._lock:
+            self._chains.setdefault(model, deque(maxlen=self.samples)).append(seconds)
+
+    def snapshot(self):
+        """Plain dict for display: rates per minute, totals, and p50/p95/p99 latencies."""
+        now = time.monotonic()
+        with self._lock:
+            rates = {}
+            for outcome, times in self._triggers.items():
+                while times and now - times[0] > self.window:
+                    times.popleft()
+                rates[outcome] = len(times) * 60.0 / self.window
+            steps = {name: dict(entry, latency=sorted(entry["latency"])) for name, entry in self._steps.items()}
+            chains = {model: sorted(values) for model, values in self._chains.items()}
+            totals = dict(self._totals)
+
+        for entry in steps.values():
+            values = entry.pop("latency")
+            entry.update(p50=_percentile(values, 50), p95=_percentile(values, 95), p99=_percentile(values, 99))
+        chains = {model: {"runs": len(values), "p50": _percentile(values, 50), "p95": _percentile(values, 95)}
+                  for model, values in chains.items()}
+        return {"per_minute": rates, "totals": totals, "steps": steps, "chains": chains}
@@ -0,0 +1,253 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import os
+import sys
+import json
+import time
+import threading
+from pathlib import Path
+
+PROBE_TIMEOUT = 3.0       # Seconds a single device may take to open + deliver a frame
+WATCH_INTERVAL = 2.0      # Hot-plug poll interval (seconds)
+
+class CameraDiscovery:
+    def __init__(self, cache_path):
+        """
+        Finds usable cameras.
+        - Devices are probed in parallel, each with its own timeout.
+        - On Linux, v4l2 metadata nodes are skipped without opening them.
+        - Results are cached per device signature; an unchanged setup skips probing.
+        - watch() polls for hot-plug changes and re-probes only new devices.
+        - report_failure() re-probes a cached camera that failed to open.
+        """
+        self.cache_path = cache_path
+        self.cameras = {}       # { display_name: cv_index }
+        self._signature = None
+        self._watch_stop = threading.Event()
+        self._watch_thread = None
+        self._on_change = None
+        self._lock = threading.Lock()
+
+    # --- PLATFORM LISTING ---
+
+    def list_devices(self):
+        """
+        Returns a list of dicts: { index, name, capture }
+        index is the OpenCV device index, capture is False for nodes we know
+        cannot deliver frames (e.g. UVC metadata nodes on Linux).
+        """
+        devices = []
+
+        # Windows: Use pygrabber (DirectShow)
+        if os.name == 'nt':
+            names = []
+            try:
+                from pygrabber.dshow_graph import FilterGraph
+                graph = FilterGraph()
+                names = graph.get_input_devices()
+            except ImportError:
+                # Fallback to PowerShell if pygrabber is missing
+                import subprocess
+                cmd = "Get-CimInstance Win32_PnPEntity | Where-Object { $_.PNPClass -eq 'Image' -or $_.PNPClass -eq 'Camera' } | Select-Object -ExpandProperty Caption"
+                try:
+                    result = subprocess.run(["powershell", "-Command", cmd], capture_output=True, text=True)
+                    if result.returncode == 0:
+                        names = [line.strip() for line in result.stdout.split('\n') if line.strip()]
+                except: pass
+            except Exception as e:
+                print(f"Windows Camera Scan Error: {e}")
+            devices = [{"index": i, "name": n, "capture": True} for i, n in enumerate(names)]
+
+        # Linux: Use /sys/class/video4linux
+        elif sys.platform.startswith("linux"):
+            try:
+                v4l_path = Path("/sys/class/video4linux")
+                if v4l_path.exists():
+                    # Sort by logical index (video0, video1...)
+                    video_devs = sorted([p for p in v4l_path.iterdir() if p.name.startswith("video")],
+                                      key=lambda x: int(x.name.replace("video", "")))
+                    for dev in video_devs:
+                        name_file = dev / "name"
+                        name = name_file.read_text().strip() if name_file.exists() else dev.name
+                        devices.append({
+                            "index": int(dev.name.replace("video", "")),
+                            "name": name,
+                            "capture": self._is_capture_node(dev)
+                        })
+            except Exception as e:
+                print(f"Linux Camera Scan Error: {e}")
+
+        return devices
+
+    def _is_capture_node(self, dev):
+        # UVC cameras expose a second node per device for metadata; only the
+        # node with 'index' 0 streams video.
+        index_file = dev / "index"
+        try:
+            if index_file.exists():
+                return int(index_file.read_text().strip()) == 0
+        except Exception:
+            pass
+        return True
+
+    def _make_signature(self, devices):
+        return [[d["index"], d["name"], d["capture"]] for d in devices]
+
+    # --- PROBING ---
+
+    def _probe_one(self, index, result):
+        import cv2
+        # Enforce DirectShow on Windows to match pygrabber's list order
+        backend = cv2.CAP_DSHOW if os.name == 'nt' else cv2.CAP_ANY
+        cap = cv2.VideoCapture(index, backend)
+        try:
+            if cap.isOpened():
+                ret, _ = cap.read()
+                result[index] = bool(ret)
+        finally:
+            cap.release()
+
+    def probe(self, indices, timeout=PROBE_TIMEOUT):
+        """
+        Opens each index on its own daemon thread and waits at most `timeout`
+        overall. Drivers that hang simply count as unavailable.
+        """
+        result = {}
+        threads = []
+        for index in indices:
+            t = threading.Thread(target=self._probe_one, args=(index, result), daemon=True)
+            t.start()
+            threads.append(t)
+
+        deadline = time.time() + timeout
+        for t in threads:
+            t.join(max(0.0, deadline - time.time()))
+
+        return [i for i in indices if result.get(i)]
+
+    def _build_map(self, devices, working):
+        cameras = {}
+        names = {d["index"]: d["name"] for d in devices}
+        for index in sorted(working):
+            if index in names:
+                cameras[f"{names[index]} ({index})"] = index
+            else:
+                cameras[f"Camera Source {index}"] = index
+        return cameras
+
+    # --- CACHE ---
+
+    def _load_cache(self):
+        if not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, "r") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _save_cache(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, "w") as f:
+                json.dump({"signature": self._signature, "cameras": self.cameras}, f, indent=4)
+        except Exception as e:
+            print(f"Camera cache save failed: {e}")
+
+    # --- PUBLIC API ---
+
+    def scan(self, use_cache=True):
+        """Returns { display_name: cv_index }."""
+        devices = self.list_devices()
+        signature = self._make_signature(devices)
+
+        cache = self._load_cache() if use_cache else None
+        if devices and cache and cache.get("signature") == signature and cache.get("cameras"):
+            # Same devices as last run: trust the cached probe results
+            with self._lock:
+                self._signature = signature
+                self.cameras = dict(cache["cameras"])
+            return dict(self.cameras)
+
+        # If no cameras reported (fallback), we try just 0 and 1 to be safe.
+        if devices:
+            candidates = [d["index"] for d in devices if d["capture"]]
+        else:
+            candidates = [0, 1]
+
+        working = self.probe(candidates)
+        with self._lock:
+            self._signature = signature
+            self.cameras = self._build_map(devices, working)
+        if devices:
+            self._save_cache()
+        return dict(self.cameras)
+
+    def watch(self, on_change, interval=WATCH_INTERVAL):
+        """
+        Starts a background hot-plug watcher.
+        on_change(cameras) is called from the watcher thread when the set changes.
+        """
+        self.stop_watching()
+        self._watch_stop = threading.Event()
+        self._on_change = on_change
+        stop = self._watch_stop
+
+        def _loop():
+            while not stop.wait(interval):
+                try:
+                    devices = self.list_devices()
+                    signature = self._make_signature(devices)
+                    if signature == self._signature:
+                        continue
+
+                    with self._lock:
+                        known = set(self.cameras.values())
+                    present = {d["index"] for d in devices if d["capture"]}
+
+                    # Only open devices that just appeared; never touch the live one
+                    working = (known & present) | set(self.probe(sorted(present - known)))
+
+                    with self._lock:
+                        self._signature = signature
+                        self.cameras = self._build_map(devices, working)
+                        cameras = dict(self.cameras)
+                    self._save_cache()
+                    on_change(cameras)
+                except Exception as e:
+                    print(f"Camera watcher error: {e}")
+
+        self._watch_thread = threading.Thread(target=_loop, name="camera-watch", daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self, timeout=1.0):
+        self._watch_stop.set()
+        thread = self._watch_thread
+        if thread is not None and thread is not threading.current_thread():
+            # A probe in progress may outlive this; the thread is a daemon
+            thread.join(timeout)
+        self._watch_thread = None
+
+    def report_failure(self, index):
+        """
+        Called when a listed camera could not be opened. Cached probe results
+        can be stale (device busy or unplugged between runs): re-probe it and,
+        if it still fails, drop it from the list and the cache.
+        Returns True if the camera works again.
+        """
+        with self._lock:
+            if index not in self.cameras.values():
+                return False
+        if self.probe([index]):
+            return True
+
+        with self._lock:
+            self.cameras = {name: i for name, i in self.cameras.items() if i != index}
+            cameras = dict(self.cameras)
+        print(f"Camera {index} failed to open; removed from the camera list")
+        self._save_cache()
+        if self._on_change:
+            self._on_change(cameras)
+        return False
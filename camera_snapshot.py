@@ -2,12 +2,15 @@
 Saves the current frame to the 'snapshots' directory.
 Argument: 'prefix=my_name' (optional)
 """
-import cv2
-import os
-import time
+from snapshot_service import get_default_service
+
+# Uses the app's snapshot pool and disk quota: must run in-process, never in a sandbox worker
+SANDBOX = False
 
 def run(context, args):
-    frame = context.get("frame")
+    frame = context.get("frame_handle")
+    if frame is None:
+        frame = context.get("frame")
     if frame is None:
         print("[SNAPSHOT] Error: No frame data in context.")
         return
@@ -19,16 +22,12 @@ def run(context, args):
         if len(parts) > 1:
             prefix = parts[1].split(" ")[0]
 
-    save_dir = "snapshots"
-    if not os.path.exists(save_dir):
-        os.makedirs(save_dir)
-        
-    timestamp = time.strftime("%Y%m%d_%H%M%S")
-    filename = f"{prefix}_{timestamp}.jpg"
-    filepath = os.path.join(save_dir, filename)
+    # Encoding and the disk write happen on the snapshot pool, not this step
+    future = get_default_service().submit(frame, prefix=prefix, timestamp=context.get("timestamp"))
 
-    try:
-        cv2.imwrite(filepath, frame)
-        print(f"[SNAPSHOT] Saved: {filepath}")
-    except Exception as e:
-        print(f"[SNAPSHOT] Save failed: {e}")
\ No newline at end of file
+    def _report(f):
+        try:
+            print(f"[SNAPSHOT] Saved: {f.result()}")
+        except Exception as e:
+            print(f"[SNAPSHOT] Save failed: {e}")
+    future.add_done_callback(_report)
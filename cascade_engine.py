@@ -0,0 +1,131 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+from engine_config import ConfigSnapshot, ConfigSlot
+
+class CascadeEngine:
+    def __init__(self, sentry_engine, face_engine):
+        """
+        Sentry-to-Face cascade.
+        SentryEngine finds people, FaceEngine only runs on the head region of each
+        person box. Empty scenes never touch the face detector.
+        Safe to call from several camera threads: this class only reads its config
+        snapshot, and both engines serialise their own inference.
+        """
+        # Own thresholds, shared ONNX session: tuning the cascade doesn't retune Sentry Mode
+        self.sentry_engine = sentry_engine.fork()
+        self.face_engine = face_engine
+
+        # --- TUNABLE PARAMETERS (Default Values) ---
+        # Read once per frame from an immutable snapshot (see engine_config)
+        self.config = ConfigSlot(ConfigSnapshot(dict(
+            head_ratio=0.40,        # Top portion of the person box searched for a face
+            side_padding=0.10,      # Extra width on each side (heads turn, boxes are tight)
+            min_person_height=80,   # Skip people too small for recognition (pixels)
+            max_faces=4             # Cap recognitions per frame in crowds
+        )))
+
+    def process_frame(self, frame):
+        """
+        Returns: list of tuples: ([x, y, w, h], score, identity)
+        identity is None when the person was too small to try recognition.
+        """
+        cfg = self.config.current
+        detections = self.sentry_engine.process_frame(frame)
+        if not detections:
+            return []
+
+        fh, fw = frame.shape[:2]
+        results = []
+        # Largest (closest) people first so the cap keeps the most useful ones
+        ordered = sorted(detections, key=lambda d: d[0][2] * d[0][3], reverse=True)
+
+        for i, (box, score, label) in enumerate(ordered):
+            x, y, w, h = box
+            identity = None
+
+            if i < cfg.max_faces and h >= cfg.min_person_height:
+                pad = int(w * cfg.side_padding)
+                x1 = max(0, x - pad)
+                x2 = min(fw, x + w + pad)
+                y1 = max(0, y)
+                y2 = min(fh, y + int(h * cfg.head_ratio))
+
+                if x2 > x1 and y2 > y1:
+                    # Slice is a view, no full-frame copy
+                    identity = self.face_engine.process_frame(frame[y1:y2, x1:x2])
+
+            results.append((box, score, identity))
+
+        return results
+
+    def get_tunable_config(self):
+        """
+        Returns the schema for the UI Model Tuner.
+        Format: { internal_var: { label, desc, type, min, max, advanced } }
+        """
+        config = {
+            "head_ratio": {
+                "label": "Head Region",
+                "desc": "How much of the top of each person box is searched for a face. Raise it if people are often seated or bending.",
+                "type": "float",
+                "min": 0.2, "max": 0.8, "step": 0.05,
+                "advanced": False
+            },
+            "min_person_height": {
+                "label": "Minimum Person Size",
+                "desc": "People shorter than this (in pixels) are flagged but not recognised. Faces that small rarely match reliably.",
+                "type": "int",
+                "min": 40, "max": 400, "step": 10,
+                "advanced": True
+            },
+            "side_padding": {
+                "label": "Side Padding",
+                "desc": "Extra width added around the head region so turned heads are not clipped.",
+                "type": "float",
+                "min": 0.0, "max": 0.5, "step": 0.05,
+                "advanced": True
+            },
+            "max_faces": {
+                "label": "Faces Per Frame",
+                "desc": "Upper limit on recognitions per frame. Keeps busy scenes from stalling the feed.",
+                "type": "int",
+                "min": 1, "max": 10, "step": 1,
+                "advanced": True
+            }
+        }
+        # Person detection thresholds are tuned on the same screen
+        config.update(self.sentry_engine.get_tunable_config())
+        return config
+
+    def update_parameter(self, key, value):
+        """Updates a parameter dynamically."""
+        self.update_parameters({key: value})
+
+    def update_parameters(self, values):
+        """Applies several parameters at once; Sentry's keys are forwarded as one batch."""
+        own = self.config.current.parameters()
+        changes = {}
+        forward = {}
+        for key, value in values.items():
+            if key in own:
+                if key in ("min_person_height", "max_faces"):
+                    value = int(round(value))
+                changes[key] = value
+            else:
+                forward[key] = value
+        if changes:
+            self.config.update(**changes)
+            print(f"[CascadeEngine] Updated {changes}")
+        if forward:
+            self.sentry_engine.update_parameters(forward)
+
+    def __getattr__(self, key):
+        # ModelTuner reads current values with getattr(); forward Sentry's thresholds
+        if key in ("sentry_engine", "face_engine", "config"):
+            raise AttributeError(key)
+        current = self.config.current
+        if key in current.parameters():
+            return getattr(current, key)
+        return getattr(self.sentry_engine, key)
@@ -0,0 +1,36 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+"""
+Saves a video clip around the event to the 'clips' directory.
+Arguments: 'pre=5 post=5 prefix=my_name' (all optional, seconds)
+"""
+import time
+from clip_recorder import get_default_recorder
+
+# Uses the app's clip ring buffers: must run in-process, never in a sandbox worker
+SANDBOX = False
+
+def _parse_args(args):
+    options = {}
+    for part in args.split():
+        if "=" in part:
+            key, value = part.split("=", 1)
+            options[key.strip()] = value.strip()
+    return options
+
+def run(context, args):
+    options = _parse_args(args)
+    try:
+        pre = float(options.get("pre", 5))
+        post = float(options.get("post", 5))
+    except ValueError:
+        pre, post = 5.0, 5.0
+    prefix = options.get("prefix", "clip")
+
+    recorder = get_default_recorder()
+    # Muxing runs on its own thread; this step returns immediately
+    recorder.record(context.get("camera", 0), context.get("timestamp") or time.time(),
+                    pre=pre, post=post, prefix=prefix)
+    print(f"[CLIP] Recording {pre}s before / {post}s after event")
@@ -0,0 +1,210 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import os
+import time
+import queue
+import threading
+from collections import deque
+from snapshot_service import DiskQuota
+
+class FrameRingBuffer:
+    def __init__(self, seconds=10, max_mb=64, fps=15, quality=70):
+        """
+        Per-camera ring of JPEG-compressed frames.
+        offer() is all the camera loop calls: it rate-limits and hands the frame
+        reference to an encoder thread, so the hot loop never encodes or copies.
+        """
+        self.seconds = seconds
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.min_interval = 1.0 / fps if fps > 0 else 0.0
+        self.quality = quality
+
+        self._frames = deque()     # (timestamp, jpeg_bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._listeners = []       # Clip jobs waiting for live frames
+        self._inbox = queue.Queue(maxsize=2)
+        self._last_offer = 0.0
+        self._stop = threading.Event()
+        threading.Thread(target=self._encode_loop, name="clip-encoder", daemon=True).start()
+
+    def offer(self, frame, timestamp):
+        """Hot path: O(1), drops frames if the encoder is behind."""
+        if timestamp - self._last_offer < self.min_interval:
+            return
+        self._last_offer = timestamp
+        try:
+            # cap.read() returns a fresh array each time, so no copy is needed
+            self._inbox.put_nowait((timestamp, frame))
+        except queue.Full:
+            pass
+
+    def _encode_loop(self):
+        import cv2 # Deferred: keeps OpenCV off the startup path
+        params = [cv2.IMWRITE_JPEG_QUALITY, int(self.quality)]
+        while not self._stop.is_set():
+            try:
+                timestamp, frame = self._inbox.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            ok, buf = cv2.imencode(".jpg", frame, params)
+            if not ok:
+                continue
+            data = buf.tobytes()
+
+            with self._lock:
+                self._frames.append((timestamp, data))
+                self._bytes += len(data)
+                # Trim by age first, then by memory cap
+                while self._frames and (timestamp - self._frames[0][0] > self.seconds
+                                        or self._bytes > self.max_bytes):
+                    _, old = self._frames.popleft()
+                    self._bytes -= len(old)
+                listeners = list(self._listeners)
+
+            for listener in listeners:
+                listener.put((timestamp, data))
+
+    def snapshot_since(self, since):
+        with self._lock:
+            return [(t, d) for t, d in self._frames if t >= since]
+
+    def subscribe(self):
+        q = queue.Queue()
+        with self._lock:
+            self._listeners.append(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            if q in self._listeners:
+                self._listeners.remove(q)
+
+    def stop(self):
+        self._stop.set()
+
+class ClipRecorder:
+    def __init__(self, save_dir="clips", seconds=10, max_mb=64, fps=15, quality=70, container="mp4",
+                 disk_mb=4096):
+        """
+        Pre/post-event clips. Keeps one FrameRingBuffer per camera; record() hands
+        the buffered past plus the live tail to a background muxer thread.
+        container: 'mp4' (mp4v) or 'avi' (MJPEG).
+        max_mb: RAM per camera ring buffer. disk_mb: quota for save_dir, oldest clips go first.
+        """
+        self.save_dir = save_dir
+        self.quota = DiskQuota(save_dir, disk_mb)
+        self.buffer_options = {"seconds": seconds, "max_mb": max_mb, "fps": fps, "quality": quality}
+        self.container = container
+        self.enabled = False
+        self._buffers = {}
+        self._lock = threading.Lock()
+
+    def buffer_for(self, camera):
+        buf = self._buffers.get(camera)
+        if buf is None:
+            with self._lock:
+                buf = self._buffers.get(camera)
+                if buf is None:
+                    buf = FrameRingBuffer(**self.buffer_options)
+                    self._buffers[camera] = buf
+        return buf
+
+    def offer(self, camera, frame, timestamp):
+        """Called by the camera loop for every frame. No-op unless a flow needs clips."""
+        if self.enabled:
+            self.buffer_for(camera).offer(frame, timestamp)
+
+    def record(self, camera, event_time, pre=5.0, post=5.0, prefix="clip", on_done=None):
+        """
+        Writes a clip covering [event_time - pre, event_time + post] in the background.
+        on_done(path_or_None) runs on the muxer thread.
+        """
+        buf = self.buffer_for(camera)
+        # Subscribe before copying the past so no frame falls between the two
+        live = buf.subscribe()
+        past = buf.snapshot_since(event_time - pre)
+        threading.Thread(target=self._mux, args=(buf, live, past, event_time, post, prefix, on_done),
+                         name="clip-muxer", daemon=True).start()
+
+    def _mux(self, buf, live, frames, event_time, post, prefix, on_done):
+        path = None
+        try:
+            end_time = event_time + post
+            last_ts = frames[-1][0] if frames else 0.0
+            while True:
+                remaining = end_time - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    ts, data = live.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if ts > last_ts:
+                    frames.append((ts, data))
+                    last_ts = ts
+                if ts >= end_time:
+                    break
+        finally:
+            buf.unsubscribe(live)
+
+        try:
+            if frames:
+                path = self._write(frames, event_time, prefix)
+                print(f"[CLIP] Saved: {path} ({len(frames)} frames)")
+            else:
+                print("[CLIP] No buffered frames for this camera.")
+        except Exception as e:
+            print(f"[CLIP] Export failed: {e}")
+        if on_done:
+            on_done(path)
+
+    def _write(self, frames, event_time, prefix):
+        import cv2
+        import numpy as np
+        lt = time.localtime(event_time)
+        folder = os.path.join(self.save_dir, time.strftime("%Y", lt), time.strftime("%m", lt), time.strftime("%d", lt))
+        os.makedirs(folder, exist_ok=True)
+        ext, fourcc = (".avi", "MJPG") if self.container == "avi" else (".mp4", "mp4v")
+        name = f"{prefix}_{time.strftime('%H%M%S', lt)}_{int(event_time * 1000) % 1000:03d}{ext}"
+        path = os.path.join(folder, name)
+
+        duration = frames[-1][0] - frames[0][0]
+        fps = (len(frames) - 1) / duration if duration > 0 else 1.0
+        fps = max(1.0, min(30.0, fps))
+
+        first = cv2.imdecode(np.frombuffer(frames[0][1], dtype=np.uint8), cv2.IMREAD_COLOR)
+        h, w = first.shape[:2]
+        tmp = path + ".part" + ext
+        writer = cv2.VideoWriter(tmp, cv2.VideoWriter_fourcc(*fourcc), fps, (w, h))
+        try:
+            for _, data in frames:
+                img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if img is not None and img.shape[:2] == (h, w):
+                    writer.write(img)
+        finally:
+            writer.release()
+        os.replace(tmp, path)
+        self.quota.account(path, os.path.getsize(path))
+        return path
+
+# --- DEFAULT RECORDER ---
+# Fed by the camera loop, used by the clip_export plugin
+
+_default_recorder = None
+_default_lock = threading.Lock()
+
+def configure_default_recorder(**options):
+    global _default_recorder
+    with _default_lock:
+        _default_recorder = ClipRecorder(**options)
+        return _default_recorder
+
+def get_default_recorder():
+    global _default_recorder
+    with _default_lock:
+        if _default_recorder is None:
+            _default_recorder = ClipRecorder()
+        return _default_recorder
@@ -0,0 +1,143 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import time
+import tkinter as tk
+import numpy as np
+from PIL import Image, ImageTk
+
+cv2 = None # Imported on first publish(): keeps OpenCV off the startup path
+
+class DisplaySurface:
+    def __init__(self, parent, bg="#000000", text="Starting Feed...", text_color="gray", idle_interval=0.0):
+        """
+        Video preview backed by one persistent Tk photo image.
+        - Processing thread: publish(frame) scales the BGR frame to the widget size
+          with OpenCV (one resize + colour conversion on the small image).
+        - Tk thread: refresh() pastes the newest frame into the existing photo in
+          place, and does nothing if no new frame was published since the last call.
+        - wants_frame() tells the processing thread whether display work is worth
+          doing: not while the preview is hidden or minimised, and not again until
+          the UI has shown the previous frame.
+        idle_interval: seconds between frames while nothing is detected (grid tiles
+        use 0.5-1 s); frames with detections are always shown at full rate.
+        """
+        self.label = tk.Label(parent, bg=bg, fg=text_color, text=text, bd=0,
+                              highlightthickness=0, padx=0, pady=0)
+        self._photo = None
+        self._photo_size = None
+        self._target = (0, 0)      # Widget size, read by the processing thread
+        self._latest = None        # (seq, rgb ndarray), swapped atomically
+        self._seq = 0
+        self._shown_seq = 0
+        self.visible = False       # Updated by refresh() on the Tk thread
+        self.idle_interval = idle_interval
+        self._last_publish = 0.0
+
+    def pack(self, **kwargs):
+        self.label.pack(**kwargs)
+
+    def exists(self):
+        return self.label.winfo_exists()
+
+    # --- PROCESSING THREAD ---
+
+    def wants_frame(self, active=True):
+        if not self.visible or self._shown_seq != self._seq:
+            return False
+        return active or time.monotonic() - self._last_publish >= self.idle_interval
+
+    def publish(self, frame, overlays=()):
+        """
+        Scales frame (BGR) to the current widget size and hands it to the UI.
+        overlays (see draw_overlays) are drawn on the scaled image, so the
+        camera frame itself is never copied or written to.
+        """
+        global cv2
+        if cv2 is None:
+            import cv2
+        tw, th = self._target
+        if tw < 2 or th < 2:
+            return # Widget not laid out yet
+        h, w = frame.shape[:2]
+        scale = min(tw / w, th / h)
+        size = (max(1, int(w * scale)), max(1, int(h * scale)))
+        if size != (w, h):
+            interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+            frame = cv2.resize(frame, size, interpolation=interpolation)
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)  # New buffer: safe to draw on
+        if overlays:
+            draw_overlays(rgb, overlays, scale=scale, rgb=True)
+        self._last_publish = time.monotonic()
+        self._seq += 1
+        self._latest = (self._seq, rgb)
+
+    # --- TK THREAD ---
+
+    def refresh(self):
+        """Shows the newest published frame. Returns True if the photo changed."""
+        if not self.label.winfo_exists():
+            self.visible = False
+            return False
+        self._target = (self.label.winfo_width(), self.label.winfo_height())
+        # Unmapped covers other tabs and withdrawn windows; iconic covers minimised
+        self.visible = bool(self.label.winfo_viewable()) and self.label.winfo_toplevel().state() != "iconic"
+
+        latest = self._latest
+        if latest is None or latest[0] == self._shown_seq:
+            return False
+        seq, rgb = latest
+        size = (rgb.shape[1], rgb.shape[0])
+        image = Image.fromarray(rgb)
+        if self._photo is None or self._photo_size != size:
+            # Only on the first frame and when the widget is resized
+            self._photo = ImageTk.PhotoImage(image=image)
+            self._photo_size = size
+            self.label.configure(image=self._photo, text="")
+        else:
+            self._photo.paste(image)
+        self._shown_seq = seq
+        return True
+
+def draw_overlays(image, overlays, scale=1.0, rgb=False):
+    """
+    Draws overlay primitives onto image in place:
+        ("box", (x, y, w, h), color, thickness)    frame coordinates, thickness -1 fills
+        ("text", text, (x, y), font_scale, color, thickness)
+        ("hud_box", ...), ("hud_text", ...)        same, in display coordinates (not scaled)
+    Frame coordinates are multiplied by scale. Colors are BGR; pass rgb=True for an RGB image.
+    Boxes are batched: one fillPoly per fill color and one polylines per
+    (color, thickness), however many detections there are.
+    """
+    global cv2
+    if cv2 is None:
+        import cv2
+    fills = {}      # { color: [corners, ...] }
+    outlines = {}   # { (color, thickness): [corners, ...] }
+    texts = []
+    for item in overlays:
+        kind = item[0]
+        factor = 1.0 if kind.startswith("hud_") else scale
+        if kind.endswith("box"):
+            _, (x, y, w, h), color, thickness = item
+            x1, y1 = int(x * factor), int(y * factor)
+            x2, y2 = int((x + w) * factor), int((y + h) * factor)
+            corners = np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], dtype=np.int32)
+            color = tuple(color[::-1]) if rgb else tuple(color)
+            if thickness < 0:
+                fills.setdefault(color, []).append(corners)
+            else:
+                outlines.setdefault((color, thickness), []).append(corners)
+        else:
+            _, text, (x, y), font_scale, color, thickness = item
+            texts.append((text, (int(x * factor), int(y * factor)), font_scale,
+                          tuple(color[::-1]) if rgb else tuple(color), thickness))
+
+    # Fills first so HUD backgrounds sit under their text
+    for color, polys in fills.items():
+        cv2.fillPoly(image, polys, color)
+    for (color, thickness), polys in outlines.items():
+        cv2.polylines(image, polys, True, color, thickness)
+    for text, origin, font_scale, color, thickness in texts:
+        cv2.putText(image, text, origin, cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, thickness)
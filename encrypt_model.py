@@ -0,0 +1,41 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+"""
+Encrypts a model into the chunked HardwareGuard container.
+
+Usage:
+    python encrypt_model.py assets/sentry_model.onnx assets/sentry_model.enc
+    python encrypt_model.py model.onnx model.enc --machine-id "<Hardware ID from Settings>"
+
+Without --machine-id the container is bound to this machine.
+"""
+import argparse
+import os
+import sys
+from security_core import HardwareGuard, DEFAULT_CHUNK_SIZE
+
+def encrypt_model(src, dest, machine_id=None, chunk_kb=DEFAULT_CHUNK_SIZE // 1024):
+    guard = HardwareGuard(machine_id=machine_id)
+    guard.encrypt_to_file(src, dest, chunk_size=chunk_kb * 1024)
+    return dest
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Encrypt a model for HardwareGuard.")
+    parser.add_argument("source", help="Plain model file (e.g. .onnx)")
+    parser.add_argument("dest", help="Encrypted output path")
+    parser.add_argument("--machine-id", default=None, help="Target device Hardware ID (default: this machine)")
+    parser.add_argument("--chunk-kb", type=int, default=DEFAULT_CHUNK_SIZE // 1024, help="Chunk size in KiB")
+    opts = parser.parse_args()
+
+    if not os.path.exists(opts.source):
+        print(f"❌ Source not found: {opts.source}")
+        sys.exit(1)
+
+    try:
+        encrypt_model(opts.source, opts.dest, opts.machine_id, opts.chunk_kb)
+        print(f"✅ Encrypted model saved to: {opts.dest}")
+    except Exception as e:
+        print(f"❌ Encryption failed: {e}")
+        sys.exit(1)
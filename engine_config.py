@@ -0,0 +1,97 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import time
+import threading
+
+class ConfigSnapshot:
+    __slots__ = ("_values", "version")
+
+    def __init__(self, values, version=0):
+        """
+        Immutable engine configuration: tunable parameters plus the resources
+        prepared for them (sessions, decode grids). Names starting with '_' are
+        resources and are not shown to the tuner.
+        """
+        object.__setattr__(self, "_values", dict(values))
+        object.__setattr__(self, "version", version)
+
+    def __getattr__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __setattr__(self, key, value):
+        raise AttributeError("ConfigSnapshot is immutable, use replace()")
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def replace(self, **changes):
+        return ConfigSnapshot({**self._values, **changes}, self.version + 1)
+
+    def parameters(self):
+        return {k: v for k, v in self._values.items() if not k.startswith("_")}
+
+class ConfigSlot:
+    def __init__(self, snapshot, debounce=0.3):
+        """
+        Holds the current ConfigSnapshot of an engine.
+        The inference thread reads `current` once per frame: a single reference
+        read, so it never blocks and never sees half an update. Writers (the Tk
+        thread, background builders) swap in a whole new snapshot under a
+        writer-only lock, so concurrent changes are not lost.
+        """
+        self._current = snapshot
+        self._write_lock = threading.Lock()
+        self._tokens = {}   # { prepare key: latest request number }
+        self.debounce = debounce
+
+    @property
+    def current(self):
+        return self._current
+
+    def update(self, **changes):
+        """Publishes a snapshot with cheap changes (thresholds) applied."""
+        with self._write_lock:
+            self._current = self._current.replace(**changes)
+            return self._current
+
+    def prepare(self, key, build, on_done=None):
+        """
+        Runs build() -> {changes} on a background thread (e.g. a new session for a
+        new model or input size) and publishes the result at the next frame boundary.
+        A newer prepare() with the same key supersedes this one; slider drags are
+        debounced so only the value the user settles on gets built.
+        on_done(error_or_None) runs on the builder thread.
+        """
+        with self._write_lock:
+            token = self._tokens.get(key, 0) + 1
+            self._tokens[key] = token
+
+        def _worker():
+            time.sleep(self.debounce)
+            if self._tokens.get(key) != token:
+                return
+            try:
+                changes = build()
+            except Exception as e:
+                print(f"[EngineConfig] Could not prepare {key}: {e}")
+                if on_done:
+                    on_done(e)
+                return
+            with self._write_lock:
+                if self._tokens.get(key) != token:
+                    return # Superseded while building
+                self._current = self._current.replace(**changes)
+            if on_done:
+                on_done(None)
+
+        threading.Thread(target=_worker, name=f"prepare-{key}", daemon=True).start()
+
+    def cancel(self, key):
+        """Drops a pending prepare() for key; a build already running is discarded when it ends."""
+        with self._write_lock:
+            self._tokens[key] = self._tokens.get(key, 0) + 1
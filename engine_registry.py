@@ -0,0 +1,81 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import threading
+import time
+
+class EngineRegistry:
+    def __init__(self):
+        """
+        Builds AI engines on first use instead of at startup.
+        Factories do their own heavy imports (TensorFlow, onnxruntime) so nothing
+        is paid for a mode the site never activates.
+        """
+        self._factories = {}   # { model_name: callable() -> engine }
+        self._engines = {}     # { model_name: engine }
+        self._errors = {}      # { model_name: last error string }
+        self._locks = {}
+
+    def register(self, name, factory):
+        self._factories[name] = factory
+        self._locks[name] = threading.Lock()
+
+    def __contains__(self, name):
+        return name in self._factories
+
+    def is_loaded(self, name):
+        return name in self._engines
+
+    def peek(self, name):
+        """Returns the engine if already built, never blocks."""
+        return self._engines.get(name)
+
+    def get_error(self, name):
+        return self._errors.get(name)
+
+    def get(self, name):
+        """
+        Returns the engine, building it if needed (blocking).
+        Returns None for unknown models or if the build failed.
+        """
+        if name in self._engines:
+            return self._engines[name]
+        if name not in self._factories:
+            return None
+
+        # Per-model lock: two callers asking for the same engine build it once,
+        # different engines can build in parallel.
+        with self._locks[name]:
+            if name in self._engines:
+                return self._engines[name]
+            start = time.time()
+            try:
+                engine = self._factories[name]()
+            except Exception as e:
+                self._errors[name] = str(e)
+                print(f"[Engines] Failed to load {name}: {e}")
+                return None
+            self._engines[name] = engine
+            self._errors.pop(name, None)
+            print(f"[Engines] Loaded {name} in {time.time() - start:.2f}s")
+            return engine
+
+    def load_async(self, name, callback=None):
+        """
+        Builds the engine on a background thread.
+        callback(engine) runs on that thread once done (engine is None on failure).
+        """
+        def _worker():
+            engine = self.get(name)
+            if callback:
+                callback(engine)
+        threading.Thread(target=_worker, daemon=True).start()
+
+    def preload(self, names):
+        """Warms the given engines one after another in the background."""
+        def _worker():
+            for name in names:
+                if name in self._factories:
+                    self.get(name)
+        threading.Thread(target=_worker, daemon=True).start()
@@ -0,0 +1,285 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+"""
+Bulk enrollment of known faces into 'assets/known_faces'.
+
+Usage:
+    python enroll_faces.py <folder | archive.zip | archive.tar.gz> [--workers N]
+
+Identity is taken from the sub-folder a photo sits in (people/alice/1.jpg -> alice),
+or from the file name for loose photos (alice.jpg -> alice).
+Re-running only processes files that were not seen before.
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tarfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+DEFAULT_DB_PATH = "assets/known_faces"
+MANIFEST_NAME = ".enroll_manifest.json"
+EMBEDDINGS_NAME = ".enroll_embeddings.npy"   # float32 rows, indexed by manifest "row"
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+# Cosine distance under which two photos of the same person count as duplicates
+DUPLICATE_THRESHOLD = 0.03
+
+# --- WORKER SIDE (runs inside the process pool) ---
+
+def _init_worker():
+    # Import once per worker, not once per image
+    global cv2, DeepFace, MODEL_NAME, DETECTOR_BACKEND
+    import cv2
+    from deepface import DeepFace
+    from recognition_engine import MODEL_NAME, DETECTOR_BACKEND
+
+def _embed_image(data):
+    """
+    Returns (status, embedding). status is 'ok', 'no_face', 'multiple_faces' or 'unreadable'.
+    """
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        return "unreadable", None
+
+    try:
+        faces = DeepFace.represent(
+            img_path=img,
+            model_name=MODEL_NAME,
+            detector_backend=DETECTOR_BACKEND,
+            enforce_detection=True
+        )
+    except ValueError:
+        # DeepFace raises ValueError when enforce_detection finds nothing
+        return "no_face", None
+
+    if len(faces) == 0:
+        return "no_face", None
+    if len(faces) > 1:
+        return "multiple_faces", None
+    return "ok", faces[0]["embedding"]
+
+# --- SOURCE DISCOVERY ---
+
+def _identity_from_path(rel_path):
+    parts = rel_path.replace("\\", "/").split("/")
+    if len(parts) > 1:
+        return parts[-2]
+    return os.path.basename(parts[-1]).split('.')[0]
+
+def _iter_sources(source):
+    """
+    Yields (source_key, identity, read_fn). read_fn returns the raw image bytes.
+    source_key includes size/mtime so edited files are picked up again.
+    """
+    if os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if not name.lower().endswith(IMAGE_EXTS):
+                    continue
+                path = os.path.join(root, name)
+                st = os.stat(path)
+                rel = os.path.relpath(path, source)
+                key = f"{os.path.abspath(path)}|{st.st_size}|{int(st.st_mtime)}"
+                yield key, _identity_from_path(rel), (lambda p=path: open(p, "rb").read())
+
+    elif zipfile.is_zipfile(source):
+        st = os.stat(source)
+        # read_fn is only valid while the archive is open: callers read during iteration
+        with zipfile.ZipFile(source) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(IMAGE_EXTS):
+                    continue
+                key = f"{os.path.abspath(source)}::{info.filename}|{info.file_size}|{int(st.st_mtime)}"
+                yield key, _identity_from_path(info.filename), (lambda i=info: zf.read(i))
+
+    elif tarfile.is_tarfile(source):
+        st = os.stat(source)
+        with tarfile.open(source) as tf:
+            for member in tf.getmembers():
+                if not member.isfile() or not member.name.lower().endswith(IMAGE_EXTS):
+                    continue
+                key = f"{os.path.abspath(source)}::{member.name}|{member.size}|{int(st.st_mtime)}"
+                yield key, _identity_from_path(member.name), (lambda m=member: tf.extractfile(m).read())
+
+    else:
+        raise ValueError(f"Unsupported enrollment source: {source}")
+
+# --- MANIFEST ---
+
+def _load_manifest(db_path):
+    """
+    Returns (manifest, embeddings). The manifest keeps keys and hashes only;
+    embeddings is a list of float32 vectors, faces[name]["row"] indexes into it.
+    """
+    path = os.path.join(db_path, MANIFEST_NAME)
+    manifest = {"sources": {}, "faces": {}}
+    if os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                manifest = json.load(f)
+        except Exception as e:
+            print(f"[ENROLL] Manifest unreadable, starting fresh: {e}")
+
+    embeddings = []
+    emb_path = os.path.join(db_path, EMBEDDINGS_NAME)
+    if os.path.exists(emb_path):
+        try:
+            embeddings = list(np.load(emb_path))
+        except Exception as e:
+            print(f"[ENROLL] Embeddings unreadable, duplicate check limited to this run: {e}")
+
+    for face in manifest["faces"].values():
+        if "embedding" in face:
+            # Older manifests stored the vectors inline
+            face["row"] = len(embeddings)
+            embeddings.append(np.asarray(face.pop("embedding"), dtype=np.float32))
+        elif face.get("row", len(embeddings)) >= len(embeddings):
+            face.pop("row", None) # Sidecar lost or older than the manifest
+    return manifest, embeddings
+
+def _save_manifest(db_path, manifest, embeddings):
+    # Sidecar first: a manifest never points at rows that were not written
+    emb_path = os.path.join(db_path, EMBEDDINGS_NAME)
+    with open(emb_path + ".tmp", "wb") as f:
+        np.save(f, np.stack(embeddings).astype(np.float32) if embeddings else np.zeros((0, 0), np.float32))
+    os.replace(emb_path + ".tmp", emb_path)
+
+    path = os.path.join(db_path, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
+
+def _cosine_distance(a, b):
+    na = np.linalg.norm(a)
+    nb = np.linalg.norm(b)
+    if na == 0 or nb == 0:
+        return 1.0
+    return 1.0 - float(np.dot(a, b)) / (na * nb)
+
+# --- MAIN PIPELINE ---
+
+def enroll(source, db_path=DEFAULT_DB_PATH, workers=None, rebuild_index=True):
+    """
+    Ingests new photos from source into db_path.
+    Returns a report dict: { identity: {added, duplicate, no_face, multiple_faces, unreadable} }
+    """
+    if not os.path.exists(db_path):
+        os.makedirs(db_path)
+
+    manifest, embeddings = _load_manifest(db_path)
+    known_hashes = {face["sha"] for face in manifest["faces"].values()}
+
+    report = {}
+    def _count(identity, status):
+        counts = report.setdefault(identity, {"added": 0, "duplicate": 0, "no_face": 0,
+                                              "multiple_faces": 0, "unreadable": 0})
+        counts[status] += 1
+
+    # 1. Collect only the sources we have not processed before
+    pending = []
+    for key, identity, read_fn in _iter_sources(source):
+        if key in manifest["sources"]:
+            continue
+        data = read_fn()
+        sha = hashlib.sha256(data).hexdigest()
+        if sha in known_hashes:
+            # Byte-identical copy of something already enrolled
+            manifest["sources"][key] = {"identity": identity, "status": "duplicate"}
+            _count(identity, "duplicate")
+            continue
+        known_hashes.add(sha)
+        pending.append((key, identity, sha, data))
+
+    if not pending:
+        # Still persist the sources skipped as duplicates so they aren't re-read next run
+        _save_manifest(db_path, manifest, embeddings)
+        print("[ENROLL] Nothing new to enroll.")
+        return report
+
+    print(f"[ENROLL] Embedding {len(pending)} new photos...")
+    start = time.time()
+
+    # Existing embeddings per identity, used for near-duplicate rejection
+    by_identity = {}
+    for face in manifest["faces"].values():
+        if "row" in face:
+            by_identity.setdefault(face["identity"], []).append(embeddings[face["row"]])
+
+    # 2. Embed across a process pool
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(_embed_image, data): (key, identity, sha, data)
+                   for key, identity, sha, data in pending}
+
+        for future in as_completed(futures):
+            key, identity, sha, data = futures[future]
+            try:
+                status, embedding = future.result()
+            except Exception as e:
+                print(f"[ENROLL] Failed on {key.split('|')[0]}: {e}")
+                status, embedding = "unreadable", None
+
+            # 3. Near-duplicate check against this identity's existing photos
+            if status == "ok":
+                embedding = np.asarray(embedding, dtype=np.float32)
+                for existing in by_identity.get(identity, []):
+                    if _cosine_distance(existing, embedding) < DUPLICATE_THRESHOLD:
+                        status = "duplicate"
+                        break
+
+            if status == "ok":
+                ext = os.path.splitext(key.split("|")[0])[1].lower() or ".jpg"
+                # FaceEngine derives the name from everything before the first '.'
+                filename = f"{identity}.{sha[:12]}{ext}"
+                with open(os.path.join(db_path, filename), "wb") as f:
+                    f.write(data)
+                manifest["faces"][filename] = {"identity": identity, "sha": sha, "row": len(embeddings)}
+                embeddings.append(embedding)
+                by_identity.setdefault(identity, []).append(embedding)
+                status = "added"
+
+            manifest["sources"][key] = {"identity": identity, "status": status}
+            _count(identity, status)
+
+    _save_manifest(db_path, manifest, embeddings)
+    print(f"[ENROLL] Done in {time.time() - start:.1f}s")
+
+    # 4. Rebuild DeepFace's representation file here instead of on the camera thread
+    if rebuild_index and any(c["added"] for c in report.values()):
+        print("[ENROLL] Rebuilding recognition index...")
+        from recognition_engine import FaceEngine
+        FaceEngine(db_path=db_path).refresh_index()
+
+    return report
+
+def print_report(report):
+    if not report:
+        return
+    print(f"{'Identity':<24}{'Added':>7}{'Dupes':>7}{'NoFace':>8}{'Multi':>7}{'Bad':>5}")
+    for identity in sorted(report):
+        c = report[identity]
+        print(f"{identity:<24}{c['added']:>7}{c['duplicate']:>7}{c['no_face']:>8}"
+              f"{c['multiple_faces']:>7}{c['unreadable']:>5}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk enroll known faces.")
+    parser.add_argument("source", help="Folder, .zip or .tar(.gz) of photos")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Known faces directory")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size")
+    parser.add_argument("--no-index", action="store_true", help="Skip rebuilding the recognition index")
+    opts = parser.parse_args()
+
+    try:
+        result = enroll(opts.source, db_path=opts.db, workers=opts.workers,
+                        rebuild_index=not opts.no_index)
+        print_report(result)
+    except Exception as e:
+        print(f"❌ Enrollment failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,227 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import os
+import gzip
+import json
+import time
+import queue
+import shutil
+import sqlite3
+import datetime
+import threading
+
+class EventSink:
+    def __init__(self, log_dir="logs", name="events", jsonl=True, sqlite=False,
+                 batch_size=256, flush_interval=1.0, max_mb=10, max_hours=24,
+                 compress=True, max_pending=10000):
+        """
+        Structured detection log with a background writer.
+        emit() only enqueues; the writer group-commits batches (one write + flush per
+        batch for JSONL, one transaction for SQLite), rotates by size/age and gzips
+        rotated segments. close() flushes everything still queued.
+        """
+        self.log_dir = log_dir
+        self.name = name
+        self.use_jsonl = jsonl
+        self.use_sqlite = sqlite
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_age = max_hours * 3600
+        self.compress = compress
+
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._stop = threading.Event()
+
+        os.makedirs(log_dir, exist_ok=True)
+        self._jsonl_file = None
+        self._jsonl_opened = 0
+        self._db = None
+        self._db_opened = 0
+
+        self._thread = threading.Thread(target=self._writer_loop, name="event-sink", daemon=True)
+        self._thread.start()
+
+    # --- PUBLIC API ---
+
+    def emit(self, event_type="detection", **fields):
+        """Queues one record. Never blocks the caller; drops if the writer is far behind."""
+        ts = fields.pop("timestamp", None) or time.time()
+        record = {
+            "ts": ts,
+            "time": datetime.datetime.fromtimestamp(ts).isoformat(timespec="milliseconds"),
+            "type": event_type
+        }
+        record.update(fields)
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=5.0):
+        """Flushes pending records and stops the writer."""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    # --- WRITER THREAD ---
+
+    def _writer_loop(self):
+        while True:
+            batch = []
+            deadline = time.time() + self.flush_interval
+            # Collect until the batch is full or the flush interval passes
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=min(remaining, 0.25)))
+                except queue.Empty:
+                    if self._stop.is_set():
+                        break
+
+            if self._stop.is_set():
+                # Drain whatever is left in one final commit
+                try:
+                    while True:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    pass
+
+            if batch:
+                try:
+                    self._commit(batch)
+                except Exception as e:
+                    print(f"[EventSink] Write failed, {len(batch)} records lost: {e}")
+
+            self._maybe_rotate()
+
+            if self._stop.is_set():
+                self._close_files()
+                return
+
+    def _commit(self, batch):
+        if self.use_jsonl:
+            f = self._open_jsonl()
+            f.write("".join(json.dumps(r, default=str) + "\n" for r in batch))
+            f.flush()
+        if self.use_sqlite:
+            db = self._open_db()
+            rows = [(r["ts"], r["type"], r.get("model"), r.get("identity"), r.get("score"),
+                     r.get("camera"), json.dumps(r, default=str)) for r in batch]
+            with db:
+                db.executemany("INSERT INTO events (ts, type, model, identity, score, camera, data) "
+                               "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        self.written += len(batch)
+
+    # --- FILES & ROTATION ---
+
+    def _jsonl_path(self):
+        return os.path.join(self.log_dir, f"{self.name}.jsonl")
+
+    def _db_path(self):
+        return os.path.join(self.log_dir, f"{self.name}.db")
+
+    def _open_jsonl(self):
+        if self._jsonl_file is None:
+            path = self._jsonl_path()
+            # Age counts from the segment's first record, so it survives restarts
+            self._jsonl_opened = time.time()
+            if os.path.exists(path) and os.path.getsize(path):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        self._jsonl_opened = float(json.loads(f.readline())["ts"])
+                except Exception:
+                    pass
+            self._jsonl_file = open(path, "a", encoding="utf-8")
+        return self._jsonl_file
+
+    def _open_db(self):
+        if self._db is None:
+            path = self._db_path()
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS events (ts REAL, type TEXT, model TEXT, "
+                             "identity TEXT, score REAL, camera TEXT, data TEXT)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts)")
+            first = self._db.execute("SELECT MIN(ts) FROM events").fetchone()[0]
+            self._db_opened = first or time.time()
+        return self._db
+
+    def _maybe_rotate(self):
+        now = time.time()
+        if self._jsonl_file is not None:
+            size = self._jsonl_file.tell()
+            if size and (size >= self.max_bytes or now - self._jsonl_opened >= self.max_age):
+                self._jsonl_file.close()
+                self._jsonl_file = None
+                self._rotate_file(self._jsonl_path(), ".jsonl")
+
+        if self._db is not None:
+            path = self._db_path()
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            if size and (size >= self.max_bytes or now - self._db_opened >= self.max_age):
+                self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._db.close()
+                self._db = None
+                self._rotate_file(path, ".db")
+
+    def _rotate_file(self, path, ext):
+        now = time.time()
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now)) + f"_{int(now * 1000) % 1000:03d}"
+        rotated = os.path.join(self.log_dir, f"{self.name}_{stamp}{ext}")
+        os.replace(path, rotated)
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        if self.compress:
+            # Compress off the writer thread so logging never stalls on gzip
+            threading.Thread(target=self._gzip, args=(rotated,), daemon=True).start()
+
+    def _gzip(self, path):
+        try:
+            with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(path)
+        except Exception as e:
+            print(f"[EventSink] Compression failed for {path}: {e}")
+
+    def _close_files(self):
+        if self._jsonl_file is not None:
+            self._jsonl_file.close()
+            self._jsonl_file = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+# --- DEFAULT SINK ---
+# Shared by AutomationManager and plugins (e.g. log_detection)
+
+_default_sink = None
+_default_lock = threading.Lock()
+
+def configure_default_sink(**options):
+    global _default_sink
+    with _default_lock:
+        if _default_sink is not None:
+            _default_sink.close()
+        _default_sink = EventSink(**options)
+        return _default_sink
+
+def get_default_sink():
+    global _default_sink
+    with _default_lock:
+        if _default_sink is None:
+            _default_sink = EventSink()
+        return _default_sink
+
+def close_default_sink():
+    global _default_sink
+    with _default_lock:
+        if _default_sink is not None:
+            _default_sink.close()
+            _default_sink = None
@@ -0,0 +1,90 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import ast
+import time
+import threading
+
+# Expression nodes a step condition may use: comparisons, boolean logic,
+# literals, context names and calls to the helpers below. No attributes,
+# subscripts, lambdas or comprehensions.
+_ALLOWED_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn,
+    ast.Is, ast.IsNot, ast.Name, ast.Load, ast.Constant, ast.List, ast.Tuple, ast.Set,
+    ast.Call, ast.IfExp
+)
+
+def _minutes(hhmm):
+    hours, _, minutes = str(hhmm).partition(":")
+    return int(hours) * 60 + int(minutes or 0)
+
+def _make_helpers(now_minutes):
+    def between(start, end):
+        """Time-of-day window, e.g. between("22:00", "06:00") (wraps midnight)."""
+        a, b = _minutes(start), _minutes(end)
+        return a <= now_minutes < b if a <= b else (now_minutes >= a or now_minutes < b)
+    return {"between": between, "len": len, "abs": abs, "min": min, "max": max}
+
+_HELPER_NAMES = set(_make_helpers(0))
+
+class _Namespace(dict):
+    # Names the context doesn't have evaluate to None instead of raising
+    def __missing__(self, key):
+        return None
+
+class Condition:
+    def __init__(self, expression):
+        """
+        A step condition compiled once, e.g.:
+            score > 0.8
+            identity in ["alice", "bob"] and between("22:00", "06:00")
+            camera_name == "Front Door" or weekday >= 5
+        Names resolve against the trigger context, plus hour, minute,
+        weekday (0 = Monday) taken from the trigger's timestamp.
+        An invalid expression never matches; see .error.
+        """
+        self.expression = expression.strip()
+        self.error = None
+        self._code = None
+        try:
+            tree = ast.parse(self.expression, mode="eval")
+            for node in ast.walk(tree):
+                if not isinstance(node, _ALLOWED_NODES):
+                    raise ValueError(f"'{type(node).__name__}' is not allowed")
+                if isinstance(node, ast.Call) and (not isinstance(node.func, ast.Name)
+                                                   or node.func.id not in _HELPER_NAMES
+                                                   or node.keywords):
+                    raise ValueError("only between(), len(), abs(), min() and max() can be called")
+            self._code = compile(tree, f"<condition {self.expression!r}>", "eval")
+        except (SyntaxError, ValueError) as e:
+            self.error = str(e)
+
+    def evaluate(self, context):
+        if self._code is None:
+            return False
+        lt = time.localtime(context.get("timestamp") or time.time())
+        names = _Namespace((k, v) for k, v in context.items() if isinstance(k, str))
+        names.update(hour=lt.tm_hour, minute=lt.tm_min, weekday=lt.tm_wday)
+        names.update(_make_helpers(lt.tm_hour * 60 + lt.tm_min))
+        try:
+            return bool(eval(self._code, {"__builtins__": {}}, names))
+        except Exception:
+            # e.g. comparing a missing (None) score: treat as not matching
+            return False
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+def compile_condition(expression):
+    """Returns the cached Condition for expression, or None for an empty one (always run)."""
+    if not expression or not expression.strip():
+        return None
+    condition = _cache.get(expression)
+    if condition is None:
+        condition = Condition(expression)
+        with _cache_lock:
+            condition = _cache.setdefault(expression, condition)
+    return condition
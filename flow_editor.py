@@ -4,6 +4,7 @@
 # ----------------------------------------------------------------------------
 import customtkinter as ctk
 import os
+from flow_conditions import compile_condition
 
 class FlowEditor(ctk.CTkToplevel):
     def __init__(self, parent, model_name, automation_manager):
@@ -30,6 +31,21 @@ class FlowEditor(ctk.CTkToplevel):
         ctk.CTkButton(header, text="Save Preset", width=100,
                      command=self._save_preset_popup).pack(side="right", padx=5)
 
+        # --- THROTTLE (Token bucket per camera / identity) ---
+        throttle_row = ctk.CTkFrame(self, fg_color="transparent")
+        throttle_row.pack(fill="x", padx=20)
+        ctk.CTkLabel(throttle_row, text="Max/min:").pack(side="left")
+        self.rate_entry = ctk.CTkEntry(throttle_row, width=50)
+        self.rate_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(throttle_row, text="Burst:").pack(side="left")
+        self.burst_entry = ctk.CTkEntry(throttle_row, width=40)
+        self.burst_entry.pack(side="left", padx=5)
+        self.per_identity_var = ctk.BooleanVar()
+        ctk.CTkCheckBox(throttle_row, text="Per identity", variable=self.per_identity_var).pack(side="left", padx=5)
+        self.per_camera_var = ctk.BooleanVar()
+        ctk.CTkCheckBox(throttle_row, text="Per camera", variable=self.per_camera_var).pack(side="left", padx=5)
+        self._render_throttle()
+
         # --- SCROLLABLE AREA (The Flow Chart) ---
         self.scroll = ctk.CTkScrollableFrame(self)
         self.scroll.pack(fill="both", expand=True, padx=20, pady=10)
@@ -76,6 +92,11 @@ class FlowEditor(ctk.CTkToplevel):
             ctk.CTkLabel(row1, text=f"Step {index + 1}", font=("Roboto", 12, "bold"), text_color="#3B8ED0").pack(side="left")
             ctk.CTkButton(row1, text="✕", width=30, fg_color="transparent", text_color="red", hover_color="#330000",
                          command=lambda i=index: self._remove_step(i)).pack(side="right")
+            # Run in a separate worker process (hung scripts get killed on timeout)
+            sandbox_default = self.manager.settings["sandbox"]["default"]
+            sandbox_var = ctk.BooleanVar(value=bool(data.get("sandbox", sandbox_default)))
+            isolate = ctk.CTkCheckBox(row1, text="Isolate", variable=sandbox_var, width=20)
+            isolate.pack(side="right", padx=10)
 
             # Row 2: Script Selection
             row2 = ctk.CTkFrame(card, fg_color="transparent")
@@ -83,8 +104,11 @@ class FlowEditor(ctk.CTkToplevel):
             ctk.CTkLabel(row2, text="Script:", width=60, anchor="w").pack(side="left")
             
             script_var = ctk.StringVar(value=data.get("script", available_scripts[0]))
-            dropdown = ctk.CTkOptionMenu(row2, values=available_scripts, variable=script_var)
+            dropdown = ctk.CTkOptionMenu(row2, values=available_scripts, variable=script_var,
+                                         command=lambda name, cb=isolate, v=sandbox_var:
+                                             self._sync_isolate(cb, v, name, reset=True))
             dropdown.pack(side="left", fill="x", expand=True)
+            self._sync_isolate(isolate, sandbox_var, script_var.get())
 
             # Row 3: Parameters (Delay & Args)
             row3 = ctk.CTkFrame(card, fg_color="transparent")
@@ -95,17 +119,47 @@ class FlowEditor(ctk.CTkToplevel):
             delay_entry = ctk.CTkEntry(row3, width=50)
             delay_entry.insert(0, str(data.get("delay", 0)))
             delay_entry.pack(side="left")
+
+            # Timeout (blank = default from automation settings)
+            ctk.CTkLabel(row3, text="Timeout (s):").pack(side="left", padx=(15, 5))
+            timeout_entry = ctk.CTkEntry(row3, width=50)
+            if data.get("timeout"):
+                timeout_entry.insert(0, str(data.get("timeout")))
+            timeout_entry.pack(side="left")
+
+            # Dependencies: blank = previous step, "none" = right away, "1,3" = after steps 1 and 3
+            ctk.CTkLabel(row3, text="After:").pack(side="left", padx=(15, 5))
+            after_entry = ctk.CTkEntry(row3, width=60, placeholder_text="prev")
+            if "after" in data:
+                after_entry.insert(0, ",".join(str(n) for n in data["after"]) or "none")
+            after_entry.pack(side="left")
             
             # Args
             ctk.CTkLabel(row3, text="Args:").pack(side="left", padx=(15, 5))
             args_entry = ctk.CTkEntry(row3)
             args_entry.insert(0, data.get("args", ""))
             args_entry.pack(side="left", fill="x", expand=True)
+
+            # Row 4: Condition (blank = always run)
+            row4 = ctk.CTkFrame(card, fg_color="transparent")
+            row4.pack(fill="x", padx=10, pady=(0, 10))
+            ctk.CTkLabel(row4, text="Only if:", width=60, anchor="w").pack(side="left")
+            condition_entry = ctk.CTkEntry(row4, placeholder_text='e.g. score > 0.8 and between("22:00", "06:00")')
+            if data.get("condition"):
+                condition_entry.insert(0, data["condition"])
+            condition_entry.pack(side="left", fill="x", expand=True)
+            condition = compile_condition(data.get("condition"))
+            if condition is not None and condition.error:
+                condition_entry.configure(border_color="red")
             
             # Store references to read later
             self.step_widgets.append({
                 "script": script_var,
+                "sandbox": sandbox_var,
+                "condition": condition_entry,
+                "after": after_entry,
                 "delay": delay_entry,
+                "timeout": timeout_entry,
                 "args": args_entry
             })
 
@@ -116,11 +170,52 @@ class FlowEditor(ctk.CTkToplevel):
         self.flow_data.append({"script": "", "delay": 0, "args": ""})
         self._render_flow()
 
+    def _sync_isolate(self, checkbox, var, script, reset=False):
+        """Plugins using shared app services (SANDBOX = False) always run in-process."""
+        if not self.manager.plugins.sandbox_safe(script):
+            var.set(False)
+            checkbox.configure(state="disabled")
+        else:
+            if reset and checkbox.cget("state") == "disabled":
+                var.set(bool(self.manager.settings["sandbox"]["default"]))
+            checkbox.configure(state="normal")
+
     def _remove_step(self, index):
         self._scrape_ui_to_data()
         self.flow_data.pop(index)
+        # Renumber dependencies: drop the removed step, shift the ones after it
+        removed = index + 1
+        for step in self.flow_data:
+            if step.get("after"):
+                step["after"] = [n - 1 if n > removed else n for n in step["after"] if n != removed]
+                if not step["after"]:
+                    step.pop("after") # Only waited on the removed step: back to 'previous step'
         self._render_flow()
 
+    def _render_throttle(self):
+        throttle = self.manager.get_flow_options(self.model_name)["throttle"]
+        self.rate_entry.delete(0, "end")
+        self.rate_entry.insert(0, str(throttle["rate_per_min"]))
+        self.burst_entry.delete(0, "end")
+        self.burst_entry.insert(0, str(throttle["burst"]))
+        self.per_identity_var.set(bool(throttle["per_identity"]))
+        self.per_camera_var.set(bool(throttle["per_camera"]))
+
+    def _scrape_options(self):
+        options = self.manager.get_flow_options(self.model_name)
+        throttle = options["throttle"]
+        try:
+            throttle["rate_per_min"] = max(0.0, float(self.rate_entry.get()))
+        except:
+            pass
+        try:
+            throttle["burst"] = max(1, int(self.burst_entry.get()))
+        except:
+            pass
+        throttle["per_identity"] = self.per_identity_var.get()
+        throttle["per_camera"] = self.per_camera_var.get()
+        return options
+
     def _scrape_ui_to_data(self):
         """Reads values from active widgets back into self.flow_data"""
         new_data = []
@@ -135,22 +230,39 @@ class FlowEditor(ctk.CTkToplevel):
                 "delay": d_val,
                 "args": widgets["args"].get()
             }
+            try:
+                t_val = float(widgets["timeout"].get())
+                if t_val > 0:
+                    step["timeout"] = t_val
+            except:
+                pass
+            after = widgets["after"].get().strip().lower()
+            if after in ("none", "0", "-"):
+                step["after"] = []
+            elif after:
+                step["after"] = [int(n) for n in after.replace(" ", "").split(",") if n.isdigit()]
+            condition = widgets["condition"].get().strip()
+            if condition:
+                step["condition"] = condition
+            if widgets["sandbox"].get() != bool(self.manager.settings["sandbox"]["default"]):
+                step["sandbox"] = widgets["sandbox"].get()
             new_data.append(step)
         self.flow_data = new_data
 
     def _apply_changes(self):
         self._scrape_ui_to_data()
-        self.manager.set_flow_for_model(self.model_name, self.flow_data)
+        self.manager.set_flow_for_model(self.model_name, self.flow_data, self._scrape_options())
         self.destroy()
 
     def _save_preset_popup(self):
         self._scrape_ui_to_data()
+        options = self._scrape_options()
         dialog = ctk.CTkInputDialog(text="Preset Name:", title="Save Flow")
         # Fix z-order
         dialog.attributes("-topmost", True)
         name = dialog.get_input()
         if name:
-            self.manager.set_flow_for_model(self.model_name, self.flow_data)
+            self.manager.set_flow_for_model(self.model_name, self.flow_data, options)
             path = self.manager.save_flow_preset(self.model_name, name)
             print(f"Saved to {path}")
 
@@ -179,4 +291,5 @@ class FlowEditor(ctk.CTkToplevel):
         if self.manager.load_flow_preset(self.model_name, name):
             self.flow_data = self.manager.get_flow_for_model(self.model_name)
             self._render_flow()
+            self._render_throttle()
         window.destroy()
\ No newline at end of file
@@ -0,0 +1,112 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import weakref
+import threading
+import cv2
+import numpy as np
+
+def _release_shared_memory(shm):
+    try:
+        shm.close()
+        shm.unlink()
+    except (FileNotFoundError, BufferError):
+        pass
+
+class SharedFrame:
+    def __init__(self, frame, timestamp=None, boxes=None):
+        """
+        Immutable frame shared by every step of an automation chain.
+        Wraps the camera frame without copying it (the array is made read-only),
+        and memoises derived artifacts so a chain encodes each one once:
+            jpeg(quality)     -> bytes
+            thumbnail(size)   -> ndarray
+            crop(box)         -> ndarray view
+        """
+        self._array = frame.view()
+        self._array.flags.writeable = False
+        self.timestamp = timestamp
+        self.boxes = [tuple(int(v) for v in b) for b in (boxes or [])]  # [(x, y, w, h), ...]
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    @property
+    def array(self):
+        """Read-only BGR ndarray. Copy it before drawing on it."""
+        return self._array
+
+    @property
+    def shape(self):
+        return self._array.shape
+
+    def _memoised(self, key, build):
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+        # Build outside the lock so different artifacts encode in parallel;
+        # a duplicate build in a race is harmless, first result wins
+        value = build()
+        with self._lock:
+            return self._memo.setdefault(key, value)
+
+    def encode(self, ext=".jpg", quality=90):
+        """Encoded image bytes (ext: .jpg, .png or .webp)."""
+        ext = ext.lower()
+        if ext in (".jpg", ".jpeg"):
+            params = [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+        elif ext == ".webp":
+            params = [cv2.IMWRITE_WEBP_QUALITY, int(quality)]
+        else:
+            params = []
+
+        def _build():
+            ok, buf = cv2.imencode(ext, self._array, params)
+            if not ok:
+                raise ValueError(f"Could not encode frame as {ext}")
+            return buf.tobytes()
+        return self._memoised(("encode", ext, int(quality)), _build)
+
+    def jpeg(self, quality=90):
+        return self.encode(".jpg", quality)
+
+    def thumbnail(self, max_side=320):
+        """Downscaled copy whose longest side is max_side (never upscales)."""
+        def _build():
+            h, w = self._array.shape[:2]
+            scale = min(1.0, max_side / max(h, w))
+            if scale >= 1.0:
+                return self._array
+            small = cv2.resize(self._array, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+            small.flags.writeable = False
+            return small
+        return self._memoised(("thumb", int(max_side)), _build)
+
+    def crop(self, box, pad=0.0):
+        """Read-only view of box (x, y, w, h), optionally padded by a fraction of its size."""
+        x, y, w, h = (int(v) for v in box)
+
+        def _build():
+            fh, fw = self._array.shape[:2]
+            px, py = int(w * pad), int(h * pad)
+            x1, y1 = max(0, x - px), max(0, y - py)
+            x2, y2 = min(fw, x + w + px), min(fh, y + h + py)
+            return self._array[y1:y2, x1:x2]
+        return self._memoised(("crop", x, y, w, h, float(pad)), _build)
+
+    def crops(self, pad=0.0):
+        """Crops of every detection box attached to this frame."""
+        return [self.crop(b, pad) for b in self.boxes]
+
+    def shared_memory(self):
+        """
+        (name, shape, dtype) of a shared-memory copy for sandboxed plugins.
+        Made once per frame and released when this handle is garbage collected.
+        """
+        def _build():
+            from multiprocessing import shared_memory
+            shm = shared_memory.SharedMemory(create=True, size=max(1, self._array.nbytes))
+            np.ndarray(self._array.shape, dtype=self._array.dtype, buffer=shm.buf)[...] = self._array
+            weakref.finalize(self, _release_shared_memory, shm)
+            return (shm.name, self._array.shape, self._array.dtype.str)
+        return self._memoised(("shm",), _build)
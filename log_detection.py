@@ -3,14 +3,21 @@
 #  Copyright (c) 2026 Devon Chase. All rights reserved.
 # ----------------------------------------------------------------------------
 """
-Appends the detection event to 'detection_log.txt'.
+Records the detection event in the structured event log (logs/events.jsonl).
 """
-import datetime
+from event_sink import get_default_sink
+
+# Uses the app's shared event log writer: must run in-process, never in a sandbox worker
+SANDBOX = False
 
 def run(context, args):
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    line = f"[{timestamp}] Model: {context.get('model')} | ID: {context.get('identity')} | Score: {context.get('score')}\n"
-    
-    with open("detection_log.txt", "a") as f:
-        f.write(line)
-    print("[SCRIPT] Logged to detection_log.txt")
\ No newline at end of file
+    # Buffered: the background writer batches, rotates and compresses
+    get_default_sink().emit(
+        "detection",
+        timestamp=context.get("timestamp"),
+        model=context.get("model"),
+        identity=context.get("identity"),
+        score=context.get("score"),
+        camera=context.get("camera"),
+        note=args or None
+    )
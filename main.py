@@ -11,14 +11,18 @@
 import customtkinter as ctk
 import threading
 import time
+import math
 import os
 import sys
 import json
 from pathlib import Path
 from PIL import Image, ImageTk
-import importlib
 from automation_core import AutomationManager
 from flow_editor import FlowEditor
+from engine_registry import EngineRegistry
+from startup_loader import StartupPipeline
+from camera_discovery import CameraDiscovery
+from display_surface import DisplaySurface
 
 # --- CONFIGURATION ---
 ctk.set_appearance_mode("System")
@@ -30,6 +34,22 @@ ASSETS_DIR = os.path.join(SCRIPT_DIR, "assets")
 def get_asset(filename):
     return os.path.join(ASSETS_DIR, filename)
 
+def load_startup_settings():
+    """
+    Reads user_configs/startup.json.
+    'preload_engines': models to warm in the background once the UI is shown,
+    e.g. ["Sentry Mode"]. Everything else loads when its card is first used.
+    """
+    settings = {"preload_engines": []}
+    path = os.path.join(SCRIPT_DIR, "user_configs", "startup.json")
+    if os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                settings.update(json.load(f))
+        except Exception as e:
+            print(f"Failed to read startup settings: {e}")
+    return settings
+
 class ToolTip(ctk.CTkToplevel):
     """Simple tooltip window for explaining parameters."""
     def __init__(self, parent, text):
@@ -144,7 +164,11 @@ class ModelTuner(ctk.CTkToplevel):
             # Input Widget (Slider or Switch)
             current_val = getattr(self.engine, key)
             
-            if meta["type"] == "float" or meta["type"] == "int":
+            if meta["type"] == "readonly":
+                # Shown for reference, fixed by the model
+                ctk.CTkLabel(row, text=str(current_val), text_color="gray").pack(side="left")
+
+            elif meta["type"] == "float" or meta["type"] == "int":
                 slider = ctk.CTkSlider(row, from_=meta["min"], to=meta["max"], 
                                      number_of_steps=int((meta["max"]-meta["min"])/meta["step"]))
                 slider.set(current_val)
@@ -201,8 +225,8 @@ class ModelTuner(ctk.CTkToplevel):
             
             # Collect current values
             data = {}
-            for key in self.config:
-                if hasattr(self.engine, key):
+            for key, meta in self.config.items():
+                if meta["type"] != "readonly" and hasattr(self.engine, key):
                     data[key] = getattr(self.engine, key)
             
             # Save to JSON
@@ -255,11 +279,15 @@ class ModelTuner(ctk.CTkToplevel):
             with open(filepath, 'r') as f:
                 data = json.load(f)
                 
-            for key, val in data.items():
-                # 1. Update Engine
-                if hasattr(self.engine, "update_parameter"):
+            # 1. Update Engine: the whole preset lands as one snapshot, so the
+            #    detector never runs a frame with half old, half new values
+            if hasattr(self.engine, "update_parameters"):
+                self.engine.update_parameters(data)
+            elif hasattr(self.engine, "update_parameter"):
+                for key, val in data.items():
                     self.engine.update_parameter(key, val)
-                
+
+            for key, val in data.items():
                 # 2. Update UI Sliders
                 if key in self.widget_refs:
                     slider, label = self.widget_refs[key]
@@ -305,9 +333,10 @@ class SplashScreen(ctk.CTkToplevel):
         self.progress.pack(pady=20)
 
     def update_progress(self, val, status_text):
+        if not self.winfo_exists(): return
         self.progress.set(val)
         self.lbl_status.configure(text=status_text)
-        self.update()
+        self.update_idletasks()
 
 class ThirdEyeApp(ctk.CTk):
     def __init__(self):
@@ -317,13 +346,17 @@ class ThirdEyeApp(ctk.CTk):
         self.active_model_name = None  # None means raw feed
         self.available_cameras = {}    # { "Camera 0": 0, ... }
         self.selected_camera_idx = 0
-        self.latest_frame_image = None # Thread-safe frame transfer
+        self.displays = {}             # { camera index: DisplaySurface } of the Live Vision tab
+        self.live_layout = "Single"    # Single | Grid
 
         # [NEW] Initialize Automation Manager
         self.automation_manager = AutomationManager()
         
-        # Engine Registry for Tuning
-        self.engines = {}
+        # Engine Registry: engines are built on first use (see _register_engines)
+        self.engines = EngineRegistry()
+        self._register_engines()
+        self.startup_settings = load_startup_settings()
+        self.camera_discovery = CameraDiscovery(os.path.join(SCRIPT_DIR, "user_configs", "camera_cache.json"))
         # 1. Hide Main Window Initially
         self.withdraw()
         
@@ -336,7 +369,8 @@ class ThirdEyeApp(ctk.CTk):
         self.active_model_name = None  # None means raw feed
         self.available_cameras = {}    # { "Camera 0": 0, ... }
         self.selected_camera_idx = 0
-        self.latest_frame_image = None # Thread-safe frame transfer
+        self.displays = {}             # { camera index: DisplaySurface } of the Live Vision tab
+        self.live_layout = "Single"    # Single | Grid
         
         # Icon Setup
         try:
@@ -350,6 +384,8 @@ class ThirdEyeApp(ctk.CTk):
         except:
             pass
 
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
         # 3. Launch Splash Screen
         self.splash = SplashScreen(self)
         
@@ -358,87 +394,59 @@ class ThirdEyeApp(ctk.CTk):
 
     def _load_resources(self):
         """Loads heavy libraries and assets while updating splash screen."""
-        
-        try:
-            # -- STAGE 1: Security Core --
-            self.splash.update_progress(0.1, "Verifying Hardware ID...")
-            global HardwareGuard
-            from security_core import HardwareGuard
-            self.guard = HardwareGuard()
-            time.sleep(0.3) 
-
-            # -- STAGE 2: AI Libraries --
-            self.splash.update_progress(0.3, "Loading Neural Engine (OpenCV)...")
-            global cv2
-            import cv2
-            
-            self.splash.update_progress(0.4, "Scanning Optical Sensors...")
-            self._scan_cameras()
-            time.sleep(0.5)
-
-            self.splash.update_progress(0.5, "Initializing Recognition Models...")
-            global FaceEngine
-            from recognition_engine import FaceEngine
-            # Initialize engine once here to avoid lag later
-            self.face_engine = FaceEngine(db_path="assets/known_faces")
-            self.engines["Face Verify"] = self.face_engine
-
-            self.splash.update_progress(0.55, "Waking Up The Robots...")
-            time.sleep(0.8)
-            
-            self.splash.update_progress(0.6, "Arming Sentry Mode...")
-            global SentryEngine
-            from sentry_engine import SentryEngine
-            self.sentry_engine = SentryEngine()
-            self.engines["Sentry Mode"] = self.sentry_engine
+        pipeline = StartupPipeline(on_progress=self._on_startup_progress)
 
-            # -- STAGE 3: UI Assets --
-            self.splash.update_progress(0.8, "Loading Interface Assets...")
-            time.sleep(0.2)
+        # Independent stages run side by side. The camera scan imports OpenCV
+        # itself only when the device cache is stale, so it does not wait for it.
+        pipeline.add_stage("security", self._load_security, label="Verifying Hardware ID...", weight=3)
+        pipeline.add_stage("opencv", self._load_opencv, label="Loading Neural Engine (OpenCV)...", weight=2)
+        pipeline.add_stage("cameras", self._scan_cameras,
+                           label="Scanning Optical Sensors...", weight=2, critical=False)
+        # AI engines (TensorFlow / onnxruntime) are not built here.
+        # They load when their card is activated or tuned, see _register_engines.
 
-            self.splash.update_progress(0.9, "Petting Soft Kitties...")
-            time.sleep(0.8)
+        try:
+            pipeline.run()
+            if not self.available_cameras:
+                self.available_cameras["No Camera Found"] = -1
 
-            # -- FINISH --
-            self.splash.update_progress(1.0, "Ready!")
-            time.sleep(0.5)
-            
             # Switch to Main Thread to update UI
             self.after(0, self._finalize_startup)
             
         except Exception as e:
             print(f"Critical Startup Error: {e}")
-            self.destroy()
+            self.after(0, self.destroy)
+
+    def _on_startup_progress(self, fraction, status_text):
+        # Called from loader threads; hand the widget update to the Tk thread
+        self.after(0, lambda: self.splash.update_progress(fraction, status_text))
+
+    def _load_security(self):
+        global HardwareGuard
+        from security_core import HardwareGuard
+        self.guard = HardwareGuard()
+
+    def _load_opencv(self):
+        global cv2, SharedFrame
+        import cv2
+        from frame_handle import SharedFrame
 
     def _scan_cameras(self):
-        """Map available cameras to indices."""
-        self.available_cameras = {}
-        real_names = self._get_platform_camera_names()
-        
-        # FIX: Only scan the number of cameras found by the OS
-        # If no cameras reported (fallback), we try just 0 and 1 to be safe.
-        scan_limit = len(real_names) if real_names else 2
-        
-        for i in range(scan_limit):
-            # Enforce DirectShow on Windows to match pygrabber's list order
-            backend = cv2.CAP_DSHOW if os.name == 'nt' else cv2.CAP_ANY
-            cap = cv2.VideoCapture(i, backend)
-            
-            if cap.isOpened():
-                ret, _ = cap.read()
-                if ret:
-                    # If we have a name at this index, use it
-                    if i < len(real_names):
-                        display_name = f"{real_names[i]} ({i})"
-                    else:
-                        display_name = f"Camera Source {i}"
-                        
-                    self.available_cameras[display_name] = i
-                cap.release()
+        """Map available cameras to indices (parallel probe, cached between runs)."""
+        self.available_cameras = self.camera_discovery.scan()
             
         if not self.available_cameras:
             self.available_cameras["No Camera Found"] = -1
 
+    def _on_cameras_changed(self, cameras):
+        """Hot-plug callback from the discovery thread."""
+        def _apply():
+            self.available_cameras = cameras or {"No Camera Found": -1}
+            print(f"Camera list changed: {list(self.available_cameras.keys())}")
+            if hasattr(self, "cam_dropdown") and self.cam_dropdown.winfo_exists():
+                self.cam_dropdown.configure(values=list(self.available_cameras.keys()))
+        self.after(0, _apply)
+
     def _finalize_startup(self):
         """Called when loading is done. Builds UI and shows window."""
         self.splash.destroy()
@@ -458,6 +466,41 @@ class ThirdEyeApp(ctk.CTk):
         self.attributes('-topmost',True)
         self.after_idle(self.attributes,'-topmost',False)
 
+        # Hot-plug: keep the source dropdown current without a rescan
+        self.camera_discovery.watch(self._on_cameras_changed)
+
+        # Optional background warm-up, only once the window is up
+        preload = self.startup_settings.get("preload_engines", [])
+        if preload:
+            self.engines.preload(preload)
+
+    def _register_engines(self):
+        """Registers engine factories. Heavy imports live inside the factories."""
+        def _face():
+            from recognition_engine import FaceEngine
+            return FaceEngine(db_path="assets/known_faces")
+
+        def _sentry():
+            from sentry_engine import SentryEngine
+            # Prefer the hardware-bound encrypted model when one is deployed
+            encrypted = os.path.join("assets", "sentry_model.enc")
+            if os.path.exists(encrypted):
+                return SentryEngine(model_path=encrypted)
+            return SentryEngine()
+
+        def _cascade():
+            # Cascade reuses both engines, nothing extra to load
+            from cascade_engine import CascadeEngine
+            sentry = self.engines.get("Sentry Mode")
+            face = self.engines.get("Face Verify")
+            if sentry is None or face is None:
+                raise RuntimeError("Sentry + Face needs both Sentry Mode and Face Verify.")
+            return CascadeEngine(sentry, face)
+
+        self.engines.register("Face Verify", _face)
+        self.engines.register("Sentry Mode", _sentry)
+        self.engines.register("Sentry + Face", _cascade)
+
     # --- UI SETUP METHODS ---
     def _setup_sidebar(self):
         self.sidebar = ctk.CTkFrame(self, width=220, corner_radius=0)
@@ -525,6 +568,7 @@ class ThirdEyeApp(ctk.CTk):
             ("Fire Watch", "Early smoke and fire detection.", "assets/img_fire.png"),
             ("Weapon Detect", "Identifies firearms in view.", "assets/img_weapon.png"),
             ("Face Verify", "Whitelist/Blacklist recognition.", "assets/img_face.png"),
+            ("Sentry + Face", "Recognizes faces on detected people only.", "assets/img_face.png"),
             ("Loitering Alert", "Flags static subjects > 30s.", "assets/img_loiter.png"),
             ("Crowd Density", "Real-time occupancy tracking.", "assets/img_crowd.png"),
             ("Abandoned Obj", "Detects left bags/packages.", "assets/img_bag.png"),
@@ -556,44 +600,6 @@ class ThirdEyeApp(ctk.CTk):
         except Exception:
             pass
 
-    def _get_platform_camera_names(self):
-        """Fetches real camera names using pygrabber (Win) or v4l2 (Linux)."""
-        names = []
-        
-        # Windows: Use pygrabber (DirectShow)
-        if os.name == 'nt':
-            try:
-                from pygrabber.dshow_graph import FilterGraph
-                graph = FilterGraph()
-                names = graph.get_input_devices()
-            except ImportError:
-                print("Tip: Install 'pygrabber' for real camera names on Windows.")
-                # Fallback to PowerShell if pygrabber is missing
-                import subprocess
-                cmd = "Get-CimInstance Win32_PnPEntity | Where-Object { $_.PNPClass -eq 'Image' -or $_.PNPClass -eq 'Camera' } | Select-Object -ExpandProperty Caption"
-                try:
-                    result = subprocess.run(["powershell", "-Command", cmd], capture_output=True, text=True)
-                    if result.returncode == 0:
-                        names = [line.strip() for line in result.stdout.split('\n') if line.strip()]
-                except: pass
-
-        # Linux: Use /sys/class/video4linux
-        elif sys.platform.startswith("linux"):
-            try:
-                v4l_path = Path("/sys/class/video4linux")
-                if v4l_path.exists():
-                    # Sort by logical index (video0, video1...)
-                    video_devs = sorted([p for p in v4l_path.iterdir() if p.name.startswith("video")], 
-                                      key=lambda x: int(x.name.replace("video", "")))
-                    for dev in video_devs:
-                        name_file = dev / "name"
-                        if name_file.exists():
-                            names.append(name_file.read_text().strip())
-            except Exception as e:
-                print(f"Linux Camera Scan Error: {e}")
-            
-        return names
-
     def _create_grid_card(self, parent, name, desc, img_path, r, c):
         card = ctk.CTkFrame(parent, corner_radius=15, border_width=1, border_color="#333333")
         card.grid(row=r, column=c, padx=10, pady=10, sticky="nsew")
@@ -655,11 +661,17 @@ class ThirdEyeApp(ctk.CTk):
         self._clear_main()
         
         ctk.CTkLabel(self.main_frame, text="Active Automation Chains", font=("Roboto", 24, "bold")).pack(pady=20)
+
+        # Live statistics (refreshed every second while this tab is open)
+        self._cancel_stats_refresh()
+        self.auto_stats_box = ctk.CTkTextbox(self.main_frame, height=220, font=("Courier New", 12))
+        self.auto_stats_box.pack(fill="x", padx=40)
+        self._refresh_automation_stats()
         
         scroll = ctk.CTkScrollableFrame(self.main_frame)
         scroll.pack(fill="both", expand=True, padx=40, pady=20)
         
-        # Refresh plugins to be safe
+        # Refresh plugins to be safe (cheap: only changed files are re-read)
         self.automation_manager.refresh_plugins()
         
         if not self.automation_manager.active_flows:
@@ -674,14 +686,65 @@ class ThirdEyeApp(ctk.CTk):
             
             ctk.CTkLabel(f, text=f"Model: {model_name}", font=("Roboto", 16, "bold")).pack(anchor="w", padx=10, pady=5)
             
-            flow_text = " ➤ ".join([f"{step['script']} ({step['delay']}s)" for step in flow])
+            flow_text = " ➤ ".join([f"{step.get('script')} ({step.get('delay', 0)}s)" for step in flow])
             ctk.CTkLabel(f, text=flow_text, text_color="#3B8ED0").pack(anchor="w", padx=10, pady=(0,10))
             
             ctk.CTkButton(f, text="Edit Flow", height=25, 
                          command=lambda n=model_name: self._open_flow_editor(n)).pack(anchor="e", padx=10, pady=(0,5))
 
+    def _cancel_stats_refresh(self):
+        # Exactly one refresh loop: a revisit must not leave the old one running
+        after_id = getattr(self, "_stats_after_id", None)
+        if after_id is not None:
+            self.after_cancel(after_id)
+            self._stats_after_id = None
+
+    def _refresh_automation_stats(self):
+        self._stats_after_id = None
+        box = getattr(self, "auto_stats_box", None)
+        if box is None or not box.winfo_exists():
+            return # Left the dashboard
+
+        stats = self.automation_manager.get_stats()
+        rate = stats["per_minute"]
+        ms = lambda v: "-" if v is None else f"{v * 1000:.0f}"
+        lines = [
+            f"Triggers/min: {rate.get('queued', 0):.0f}   Throttled/min: {rate.get('throttled', 0):.0f}   "
+            f"Merged/min: {rate.get('merged', 0):.0f}",
+            f"Queue depth: {stats['queue_depth']}   Steps running: {stats['inflight_steps']}   "
+            f"Dropped: {stats['executor']['dropped']}   Coalesced: {stats['executor']['coalesced']}   "
+            f"Throttled total: {stats['throttled_total']}",
+            f"Snapshot queue: {stats['snapshot_queue']}   Log records dropped: {stats['events_dropped']}   "
+            f"Sandbox restarts: {stats['sandbox']['restarts']}",
+            f"Webhooks sent: {stats['webhooks']['sent']}   Retries: {stats['webhooks']['retries']}   "
+            f"Spooled: {stats['webhooks']['spooled']}   Dropped: {stats['webhooks']['dropped']}",
+            "",
+            f"{'PLUGIN':<22}{'RUNS':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'FAIL':>6}{'T/O':>5}  LAST ERROR"
+        ]
+        # Slowest first: the plugin dragging reaction time down is on top
+        steps = sorted(stats["steps"].items(), key=lambda kv: kv[1]["p95"] or 0, reverse=True)
+        for name, st in steps:
+            lines.append(f"{str(name)[:21]:<22}{st['runs']:>6}{ms(st['p50']):>9}{ms(st['p95']):>9}{ms(st['p99']):>9}"
+                         f"{st['failures']:>6}{st['timeouts']:>5}  {(st['last_error'] or '')[:60]}")
+        if stats["chains"]:
+            lines.append("")
+            for model, ch in stats["chains"].items():
+                lines.append(f"Chain {model}: {ch['runs']} runs, detection-to-done p50 {ms(ch['p50'])} ms, "
+                             f"p95 {ms(ch['p95'])} ms")
+
+        box.configure(state="normal")
+        box.delete("1.0", "end")
+        box.insert("1.0", "\n".join(lines))
+        box.configure(state="disabled")
+        self._stats_after_id = self.after(1000, self._refresh_automation_stats)
+
     def _open_tuner(self, model_name):
-        engine = self.engines.get(model_name)
+        if model_name in self.engines and not self.engines.is_loaded(model_name):
+            # Build the engine off the UI thread, then open the tuner
+            self.engines.load_async(model_name,
+                                    callback=lambda e: self.after(0, lambda: ModelTuner(self, model_name, e)))
+            return
+        engine = self.engines.peek(model_name)
         if engine:
             tuner = ModelTuner(self, model_name, engine)
         else:
@@ -690,6 +753,9 @@ class ThirdEyeApp(ctk.CTk):
             
     def _activate_and_switch(self, model_name):
         self.active_model_name = model_name
+        # Start loading now; the feed shows raw frames until the engine is ready
+        if model_name in self.engines and not self.engines.is_loaded(model_name):
+            self.engines.load_async(model_name)
         self.show_live_vision()
 
     # --- LIVE VISION TAB ---
@@ -712,6 +778,11 @@ class ThirdEyeApp(ctk.CTk):
         self.cam_dropdown.set(cam_options[0] if cam_options else "No Camera")
         self.cam_dropdown.pack(side="left")
 
+        # Layout: one camera, or every camera as a grid
+        layout = ctk.CTkSegmentedButton(controls, values=["Single", "Grid"], command=self._on_layout_change)
+        layout.set(self.live_layout)
+        layout.pack(side="left", padx=15)
+
         # Active Model Indicator
         model_text = f"ACTIVE MODEL: {self.active_model_name}" if self.active_model_name else "RAW FEED"
         color = "#e63946" if self.active_model_name else "#2a9d8f"
@@ -725,20 +796,60 @@ class ThirdEyeApp(ctk.CTk):
         self.video_container = ctk.CTkFrame(self.main_frame, fg_color="#000000")
         self.video_container.pack(fill="both", expand=True, padx=20, pady=(0, 20))
         
-        self.video_label = ctk.CTkLabel(self.video_container, text="Starting Feed...", text_color="gray")
-        self.video_label.pack(expand=True, fill="both")
-
         # Start Camera Thread
         self.stop_event = threading.Event()
-        
-        # Determine initial camera index
-        start_cam = self.available_cameras.get(self.cam_dropdown.get(), 0)
-        
-        threading.Thread(target=self._camera_processing_loop, args=(start_cam,), daemon=True).start()
+
+        grid_cams = [i for i in self.available_cameras.values() if i != -1][:16]
+        if self.live_layout == "Grid" and len(grid_cams) > 1:
+            self.cam_dropdown.configure(state="disabled")
+            self._build_camera_grid(grid_cams)
+        else:
+            # One persistent photo image, updated in place from the processing thread's frames
+            display = DisplaySurface(self.video_container)
+            display.pack(expand=True, fill="both")
+
+            # Determine initial camera index
+            start_cam = self.available_cameras.get(self.cam_dropdown.get(), 0)
+            self.displays = {start_cam: display}
+            threading.Thread(target=self._camera_processing_loop, args=(start_cam, self.stop_event), daemon=True).start()
         
         # Start UI Update Loop (Main Thread)
         self._update_ui_loop()
 
+    def _build_camera_grid(self, cam_indices):
+        """
+        One tile per camera, each fed by that camera's own processing thread.
+        The threads share the active engine instance; engines serialise their own
+        inference (see SentryEngine / FaceEngine), so frames queue per engine.
+        """
+        cols = max(1, math.ceil(math.sqrt(len(cam_indices))))
+        rows = (len(cam_indices) + cols - 1) // cols
+        for c in range(cols):
+            self.video_container.grid_columnconfigure(c, weight=1, uniform="tile")
+        for r in range(rows):
+            self.video_container.grid_rowconfigure(r, weight=1, uniform="tile")
+
+        names = {i: n for n, i in self.available_cameras.items()}
+        # Idle tiles refresh at 1-2 fps (smaller tiles slower); tiles with detections at full rate
+        idle_interval = 0.5 if len(cam_indices) <= 4 else 1.0
+        self.displays = {}
+        for n, cam_index in enumerate(cam_indices):
+            tile = ctk.CTkFrame(self.video_container, fg_color="#000000", corner_radius=0)
+            tile.grid(row=n // cols, column=n % cols, sticky="nsew", padx=2, pady=2)
+            ctk.CTkLabel(tile, text=names.get(cam_index, f"Camera {cam_index}"), height=18,
+                         font=("Roboto", 11), text_color="gray").pack(anchor="w", padx=4)
+            display = DisplaySurface(tile, idle_interval=idle_interval)
+            display.pack(expand=True, fill="both")
+            self.displays[cam_index] = display
+            threading.Thread(target=self._camera_processing_loop, args=(cam_index, self.stop_event), daemon=True).start()
+
+    def _on_layout_change(self, value):
+        if value != self.live_layout:
+            self.live_layout = value
+            self._stop_camera()
+            # Brief pause to let the threads die
+            self.after(200, self.show_live_vision)
+
     def _on_cam_change(self, selected_text):
         new_idx = self.available_cameras.get(selected_text)
         if new_idx is not None:
@@ -748,124 +859,177 @@ class ThirdEyeApp(ctk.CTk):
 
     def _restart_camera(self, idx):
         self.stop_event = threading.Event()
-        threading.Thread(target=self._camera_processing_loop, args=(idx,), daemon=True).start()
+        # Same surface, new source
+        self.displays = {idx: display for display in self.displays.values()}
+        threading.Thread(target=self._camera_processing_loop, args=(idx, self.stop_event), daemon=True).start()
+        # The old stop_event ended the UI loop too
+        self._update_ui_loop()
 
     def _update_ui_loop(self):
-        """Updates the image label from the main thread to prevent flickering."""
-        # Check if attribute exists AND the actual widget still exists
-        if (hasattr(self, 'video_label') and 
-            self.video_label is not None and 
-            self.video_label.winfo_exists() and 
-            self.latest_frame_image):
-            
+        """Updates the preview from the main thread to prevent flickering."""
+        displays = [d for d in self.displays.values() if d.exists()]
+        if not displays:
+            return # Left the Live Vision tab
+        for display in displays:
             try:
-                self.video_label.configure(image=self.latest_frame_image, text="")
-            except Exception:
-                pass # Ignore errors if widget is destroyed mid-update
+                # No-op for tiles whose processing thread hasn't produced a new frame
+                display.refresh()
+            except Exception as e:
+                print(f"Display Error: {e}")
         
         # Only schedule next update if not stopped
         if not self.stop_event.is_set():
-            self.after(30, self._update_ui_loop) # ~30 FPS UI refresh
+            # ~30 FPS UI refresh; just a visibility poll while minimised
+            visible = any(d.visible for d in displays)
+            self.after(30 if visible else 250, self._update_ui_loop)
 
-    def _camera_processing_loop(self, cam_index):
+    def _camera_processing_loop(self, cam_index, stop_event=None):
         if cam_index == -1: return
+        # Bound to the event it was started with, so a restart can't revive it
+        stop_event = stop_event or self.stop_event
         cap = cv2.VideoCapture(cam_index)
+        cam_name = next((n for n, i in self.available_cameras.items() if i == cam_index), str(cam_index))
+        frames = 0
+        reprobed = False
         
-        # [FIX] Initialize timing variables BEFORE the loop
-        last_trigger_time = 0
-        cooldown_seconds = 5.0 
-        
-        while not self.stop_event.is_set():
+        while not stop_event.is_set():
             ret, frame = cap.read()
-            if not ret: break
+            if not ret:
+                if frames == 0 and not reprobed:
+                    # Listed (possibly from the cache) but unusable: re-probe and fix the list.
+                    # Release first: single-open drivers would fail the probe on our own handle
+                    cap.release()
+                    reprobed = True
+                    if self.camera_discovery.report_failure(cam_index) and not stop_event.is_set():
+                        cap = cv2.VideoCapture(cam_index)
+                        continue
+                break
+            frames += 1
+
+            # Pre-event clip buffer: a reference hand-off, encoding happens elsewhere
+            self.automation_manager.clip_recorder.offer(cam_index, frame, time.time())
 
             # [FIX] Initialize detection_data every frame so it always exists
             detection_data = None
+            extra_events = [] # Further identities seen in the same frame (cascade mode)
+
+            overlays = [] # Drawn on the display-size image, only when rendering
             
             # --- PROCESS BASED ON ACTIVE MODEL ---
             identity = "Unknown"
-            processed_frame = frame.copy()
 
-            if self.active_model_name == "Face Verify":
+            # Never block the feed on a model that is still loading
+            engine = self.engines.peek(self.active_model_name)
+            if engine is None and self.active_model_name in self.engines:
+                status = self.engines.get_error(self.active_model_name) or "LOADING MODEL..."
+                overlays.append(("hud_text", status[:60], (20, 50), 0.8, (0, 200, 255), 2))
+
+            elif self.active_model_name == "Face Verify":
                 # Only run heavy face detection if selected
-                identity = self.face_engine.process_frame(frame)
+                identity = engine.process_frame(frame)
                 
                 # Draw Box
                 color = (0, 255, 0) if identity != "Unknown" else (0, 0, 255)
-                cv2.rectangle(processed_frame, (0,0), (640, 50), (0,0,0), -1)
-                cv2.putText(processed_frame, f"ID: {identity}", (20, 35), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
+                overlays.append(("hud_box", (0, 0, 640, 50), (0, 0, 0), -1))
+                overlays.append(("hud_text", f"ID: {identity}", (20, 35), 1, color, 2))
                 
                 # [FIX] Capture data for automation
                 if identity != "Unknown":
                     detection_data = {"identity": identity, "score": 1.0}
             
             elif self.active_model_name == "Sentry Mode":
-                detections = self.sentry_engine.process_frame(frame)
+                detections = engine.process_frame(frame)
                 
                 if detections:
                     # Alert Status
-                    cv2.putText(processed_frame, "SENTRY ALERT", (20, 50), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+                    overlays.append(("hud_text", "SENTRY ALERT", (20, 50), 1, (0, 0, 255), 2))
                     
                     for (box, score, label) in detections:
                         x, y, w, h = box
                         # Draw Red Box
-                        cv2.rectangle(processed_frame, (x, y), (x+w, y+h), (0, 0, 255), 2)
+                        overlays.append(("box", (x, y, w, h), (0, 0, 255), 2))
                         
                         # Display "Person" and Confidence
                         text = f"{label.upper()} {int(score * 100)}%"
-                        cv2.putText(processed_frame, text, (x, y-10),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
+                        overlays.append(("text", text, (x, y-10), 0.6, (0, 0, 255), 2))
                     
                     # [FIX] Capture the first detection for automation
                     box, score, label = detections[0]
-                    detection_data = {"identity": label, "score": float(score)}
+                    detection_data = {"identity": label, "score": float(score),
+                                      "boxes": [d[0] for d in detections]}
                 else:
                     # Scanning Status
-                    cv2.putText(processed_frame, "SENTRY ACTIVE: SCANNING...", (20, 50), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+                    overlays.append(("hud_text", "SENTRY ACTIVE: SCANNING...", (20, 50), 1, (0, 255, 0), 2))
+
+            elif self.active_model_name == "Sentry + Face":
+                people = engine.process_frame(frame)
+
+                if people:
+                    for (box, score, person_id) in people:
+                        x, y, w, h = box
+                        known = person_id not in (None, "Unknown") and not person_id.startswith("Error")
+                        color = (0, 255, 0) if known else (0, 0, 255)
+                        overlays.append(("box", (x, y, w, h), color, 2))
+
+                        text = person_id.upper() if known else f"PERSON {int(score * 100)}%"
+                        overlays.append(("text", text, (x, y-10), 0.6, color, 2))
+
+                        # One event per distinct identity; the throttle keys on it
+                        event_id = person_id if known else "Person"
+                        if detection_data is None:
+                            detection_data = {"identity": event_id, "score": float(score)}
+                        elif event_id not in [detection_data["identity"]] + [e["identity"] for e in extra_events]:
+                            extra_events.append({"identity": event_id, "score": float(score)})
+                    detection_data["boxes"] = [p[0] for p in people]
+                else:
+                    overlays.append(("hud_text", "CASCADE ACTIVE: SCANNING...", (20, 50), 1, (0, 255, 0), 2))
 
             # --- AUTOMATION TRIGGER ---
             current_time = time.time()
             # Now detection_data is guaranteed to be either None or a dict
-            if detection_data and (current_time - last_trigger_time > cooldown_seconds):
-                # Prepare context
-                context = {
-                    "model": self.active_model_name,
-                    "identity": detection_data["identity"],
-                    "score": detection_data["score"],
-                    "timestamp": current_time,
-                    "frame": frame.copy()  # <--- NEW: Passes the image to plugins
-                }   
-                # Trigger the flow manager
-                self.automation_manager.trigger_flow(self.active_model_name, context)
-                
-                last_trigger_time = current_time
+            if detection_data:
+                # One read-only handle shared by every step: no per-trigger copy, and
+                # JPEG/thumbnail/crops are computed once for the whole chain
+                shared = SharedFrame(frame, timestamp=current_time, boxes=detection_data.get("boxes"))
+                for event in [detection_data] + extra_events:
+                    context = {
+                        "model": self.active_model_name,
+                        "identity": event["identity"],
+                        "score": event["score"],
+                        "timestamp": current_time,
+                        "camera": cam_index,
+                        "camera_name": cam_name,
+                        "frame": shared.array,     # Read-only ndarray (legacy plugins)
+                        "frame_handle": shared     # Memoised encodes, thumbnails and crops
+                    }
+                    # Per-flow token buckets (camera + identity) replace the old global cooldown
+                    self.automation_manager.trigger_flow(self.active_model_name, context)
             
             # --- PREPARE FOR UI ---
-            try:
-                frame_rgb = cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB)
-                im_pil = Image.fromarray(frame_rgb)
-                ctk_img = ctk.CTkImage(light_image=im_pil, dark_image=im_pil, size=(800, 600))
-                self.latest_frame_image = ctk_img
-            except Exception as e:
-                print(f"Frame Error: {e}")
-                continue
+            # Display work only for frames the UI will show: none while the feed
+            # is hidden or minimised, none for frames the 30 ms poll would skip,
+            # and idle grid tiles only every idle_interval. Inference and
+            # automation above run regardless.
+            display = self.displays.get(cam_index)
+            if display is not None and display.wants_frame(active=detection_data is not None):
+                try:
+                    # Scaled to the widget once here, overlays drawn on the scaled
+                    # image (no full-resolution copy); the Tk thread only pastes it
+                    display.publish(frame, overlays)
+                except Exception as e:
+                    print(f"Frame Error: {e}")
+                    continue
                 
         cap.release()
 
     def _trigger_user_scripts(self, name):
-        plugin_dir = "plugins"
-        if not os.path.exists(plugin_dir): return
-        for filename in os.listdir(plugin_dir):
-            if filename.endswith(".py"):
-                module_name = f"plugins.{filename[:-3]}"
+        registry = self.automation_manager.plugins
+        registry.scan()
+        for plugin_name in registry.names(entry_point="on_recognition"):
+            hook = registry.get(plugin_name, entry_point="on_recognition")
+            if hook:
                 try:
-                    user_plugin = importlib.import_module(module_name)
-                    importlib.reload(user_plugin)
-                    if hasattr(user_plugin, "on_recognition"):
-                        user_plugin.on_recognition(name)
+                    hook["func"](name)
                 except Exception:
                     pass
 
@@ -877,9 +1041,20 @@ class ThirdEyeApp(ctk.CTk):
 
     def _stop_camera(self):
         if hasattr(self, 'stop_event'):
+            if not self.stop_event.is_set():
+                # Pending reactions belong to the feed that just stopped
+                self.automation_manager.cancel_pending()
             self.stop_event.set()
 
+    def _on_close(self):
+        self.camera_discovery.stop_watching()
+        self._stop_camera()
+        self.automation_manager.shutdown()
+        self.destroy()
+
     def _clear_main(self):
+        self._cancel_stats_refresh()
+        self.displays = {}
         for widget in self.main_frame.winfo_children():
             widget.destroy()
 
@@ -0,0 +1,165 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import os
+import ast
+import sys
+import inspect
+import hashlib
+import importlib
+import threading
+
+class PluginRegistry:
+    def __init__(self, plugin_dir):
+        """
+        Tracks plugins in plugin_dir by mtime/size and content hash.
+        scan() only re-reads files that changed and never executes plugin code:
+        descriptions and entry points come from parsing the source.
+        A plugin opts out of sandboxing with a module-level 'SANDBOX = False'.
+        Modules are imported on first use and reloaded only after they change.
+        """
+        self.plugin_dir = plugin_dir
+        self.package = os.path.basename(os.path.normpath(plugin_dir))
+        self._records = {}   # { name: record dict }
+        self._lock = threading.RLock()
+        self._import_lock = threading.Lock()  # Imports can be slow; keep scan() responsive
+
+    def scan(self):
+        """Cheap re-scan: stat every file, parse only the ones that changed."""
+        if not os.path.isdir(self.plugin_dir):
+            return
+        seen = set()
+        changed = False
+
+        for entry in os.scandir(self.plugin_dir):
+            if not entry.name.endswith(".py") or entry.name == "__init__.py":
+                continue
+            name = entry.name[:-3]
+            seen.add(name)
+            st = entry.stat()
+
+            with self._lock:
+                record = self._records.get(name)
+                if record and record["mtime"] == st.st_mtime_ns and record["size"] == st.st_size:
+                    continue
+
+                try:
+                    with open(entry.path, "rb") as f:
+                        source = f.read()
+                except OSError as e:
+                    print(f"Failed to read plugin {name}: {e}")
+                    continue
+
+                digest = hashlib.sha256(source).hexdigest()
+                if record and record["hash"] == digest:
+                    # Touched but not edited
+                    record["mtime"], record["size"] = st.st_mtime_ns, st.st_size
+                    continue
+
+                info = self._inspect_source(name, source)
+                self._records[name] = {
+                    "mtime": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "hash": digest,
+                    "desc": info["desc"],
+                    "entry_points": info["entry_points"],
+                    "is_async": info["is_async"],
+                    "sandbox_safe": info["sandbox_safe"],
+                    "module": record["module"] if record else None,
+                    "stale": record is not None and record["module"] is not None
+                }
+                changed = True
+
+        with self._lock:
+            for name in list(self._records):
+                if name not in seen:
+                    del self._records[name]
+                    sys.modules.pop(f"{self.package}.{name}", None)
+                    changed = True
+
+        if changed:
+            # New files must be visible to the import system
+            importlib.invalidate_caches()
+
+    def _inspect_source(self, name, source):
+        desc = "No description."
+        entry_points = set()
+        is_async = False
+        sandbox_safe = True
+        try:
+            tree = ast.parse(source, filename=f"{name}.py")
+            doc = ast.get_docstring(tree)
+            if doc:
+                desc = doc.strip()
+            for node in tree.body:
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    entry_points.add(node.name)
+                    if node.name == "run":
+                        is_async = isinstance(node, ast.AsyncFunctionDef)
+                elif isinstance(node, ast.Assign):
+                    # e.g. run = some_factory(); only known after import
+                    for target in node.targets:
+                        if isinstance(target, ast.Name):
+                            entry_points.add(target.id)
+                            if target.id == "SANDBOX" and isinstance(node.value, ast.Constant):
+                                sandbox_safe = bool(node.value.value)
+        except SyntaxError as e:
+            print(f"Failed to load plugin {name}: {e}")
+        return {"desc": desc, "entry_points": entry_points, "is_async": is_async,
+                "sandbox_safe": sandbox_safe}
+
+    # --- QUERIES (no imports) ---
+
+    def names(self, entry_point="run"):
+        with self._lock:
+            return sorted(n for n, r in self._records.items() if entry_point in r["entry_points"])
+
+    def keys(self):
+        return self.names()
+
+    def describe(self, name):
+        record = self._records.get(name)
+        return record["desc"] if record else None
+
+    def sandbox_safe(self, name):
+        """False for plugins that declare SANDBOX = False (they rely on in-process services)."""
+        record = self._records.get(name)
+        return record["sandbox_safe"] if record else True
+
+    # --- LAZY LOADING ---
+
+    def _load_module(self, name):
+        with self._import_lock:
+            record = self._records.get(name)
+            if record is None:
+                return None
+            if record["module"] is not None and not record["stale"]:
+                return record["module"]
+
+            mod_path = f"{self.package}.{name}"
+            try:
+                existing = record["module"] or sys.modules.get(mod_path)
+                if existing is None:
+                    module = importlib.import_module(mod_path)
+                else:
+                    module = importlib.reload(existing) # Ensure fresh code
+            except Exception as e:
+                print(f"Failed to load plugin {name}: {e}")
+                return None
+
+            record["module"] = module
+            record["stale"] = False
+            return module
+
+    def get(self, name, entry_point="run"):
+        """
+        Returns {"func", "desc", "is_async"} for the plugin, importing it on first use.
+        None if the plugin is missing, fails to import or lacks the entry point.
+        """
+        module = self._load_module(name)
+        if module is None or not hasattr(module, entry_point):
+            return None
+        func = getattr(module, entry_point)
+        return {"func": func, "desc": self._records[name]["desc"],
+                "is_async": inspect.iscoroutinefunction(func)}
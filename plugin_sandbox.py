@@ -0,0 +1,292 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import os
+import sys
+import time
+import queue
+import pickle
+import threading
+import traceback
+import importlib
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+# Context values that cross the process boundary as-is; anything else
+# (engine objects, callbacks...) stays in the main process
+_PLAIN_TYPES = (str, int, float, bool, type(None), list, tuple, dict)
+
+class SandboxError(Exception):
+    """A plugin raised inside a sandbox worker. remote_traceback holds the worker's traceback."""
+    def __init__(self, message, remote_traceback=""):
+        super().__init__(message)
+        self.remote_traceback = remote_traceback
+
+# --- WORKER PROCESS ---
+
+def _worker_main(conn, plugin_dir):
+    package = os.path.basename(os.path.normpath(plugin_dir))
+    modules = {}     # { name: (mtime, module) }
+    attached = {}    # { shm name: SharedMemory } most recent frames only
+
+    def _load(name):
+        path = os.path.join(plugin_dir, f"{name}.py")
+        mtime = os.stat(path).st_mtime
+        cached = modules.get(name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        mod_path = f"{package}.{name}"
+        if cached or mod_path in sys.modules:
+            module = importlib.reload(sys.modules[mod_path])
+        else:
+            module = importlib.import_module(mod_path)
+        modules[name] = (mtime, module)
+        return module
+
+    def _restore(payload):
+        context = dict(payload)
+        frame_info = context.pop("__frame__", None)
+        if frame_info is not None:
+            import numpy as np
+            from multiprocessing import shared_memory
+            from frame_handle import SharedFrame
+            shm_name, shape, dtype, timestamp, boxes = frame_info
+            shm = attached.get(shm_name)
+            if shm is None:
+                shm = shared_memory.SharedMemory(name=shm_name)
+                attached[shm_name] = shm
+                while len(attached) > 8:
+                    old = attached.pop(next(iter(attached)))
+                    try:
+                        old.close()
+                    except BufferError:
+                        pass # A plugin still holds a view; the mapping goes with the worker
+            frame = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+            frame.flags.writeable = False
+            handle = SharedFrame(frame, timestamp=timestamp, boxes=boxes)
+            context["frame"] = handle.array
+            context["frame_handle"] = handle
+        return context
+
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            return
+        if msg[0] == "stop":
+            return
+        if msg[0] == "preload":
+            for name in msg[1]:
+                try:
+                    _load(name)
+                except Exception as e:
+                    print(f"[SANDBOX] Preload of {name} failed: {e}")
+            continue
+
+        _, name, entry_point, payload, args = msg
+        try:
+            func = getattr(_load(name), entry_point)
+            result = func(_restore(payload), args)
+            if hasattr(result, "__await__"):
+                import asyncio
+                result = asyncio.run(result)
+            try:
+                pickle.dumps(result)
+            except Exception:
+                result = repr(result)
+            reply = ("ok", result)
+        except BaseException as e:
+            reply = ("error", f"{type(e).__name__}: {e}", traceback.format_exc())
+        try:
+            conn.send(reply)
+        except (EOFError, OSError):
+            return
+
+# --- MAIN PROCESS SIDE ---
+
+class _Worker:
+    def __init__(self, ctx, plugin_dir, preload):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, plugin_dir),
+                                   name="plugin-sandbox", daemon=True)
+        self.process.start()
+        child.close()
+        if preload:
+            self.conn.send(("preload", list(preload)))
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1.0)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(1.0)
+        self.conn.close()
+
+class PluginSandbox:
+    def __init__(self, plugin_dir="plugins", workers=2):
+        """
+        Runs plugins in a pool of pre-started worker processes.
+        - Workers stay warm: plugin modules are imported once and reloaded only when the file changes.
+        - A step that overruns its timeout gets its worker killed and replaced.
+        - Frames go through shared memory (one copy per frame, reused by every step);
+          only plain context values are pickled.
+        Plugin errors come back as SandboxError, timeouts as TimeoutError.
+
+        Safe to isolate: plugins that only use their context, args and their own
+        resources (system_alert, visual_flash, scripts calling external tools).
+        Not safe: plugins using the app's process-wide services (get_default_recorder,
+        get_default_sink, get_default_service, get_default_client). A worker would
+        get its own empty copy, and a killed worker loses what it had queued.
+        Those plugins declare SANDBOX = False and AutomationManager runs them in-process.
+        """
+        self.plugin_dir = plugin_dir
+        self.size = max(1, int(workers))
+        # spawn: never fork a process that holds Tk, ONNX sessions and camera threads
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._busy = set()
+        self._lock = threading.Lock()
+        self._started = False
+        self._running = True
+        self._preload = set()
+        self._spawn_error = None   # Last worker start failure, cleared by a successful start
+        # Callers wait for a free worker here, not on the automation loop
+        self._callers = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="sandbox-call")
+        self.stats = {"calls": 0, "errors": 0, "timeouts": 0, "restarts": 0}
+
+    # --- POOL ---
+
+    def start(self, preload=()):
+        """Starts the workers in the background (idempotent). preload: plugin names to import up front."""
+        with self._lock:
+            self._preload.update(preload)
+            if self._started or not self._running:
+                return
+            self._started = True
+        threading.Thread(target=self._spawn_workers, args=(self.size,), daemon=True).start()
+
+    def _spawn_workers(self, count):
+        for _ in range(count):
+            if not self._running:
+                return
+            try:
+                self._idle.put(_Worker(self._ctx, self.plugin_dir, sorted(self._preload)))
+                self._spawn_error = None
+            except Exception as e:
+                self._spawn_error = str(e)
+                print(f"[SANDBOX] Could not start worker: {e}")
+
+    def _replace(self, worker):
+        with self._lock:
+            self._busy.discard(worker)
+            self.stats["restarts"] += 1
+        worker.kill()
+        threading.Thread(target=self._spawn_workers, args=(1,), daemon=True).start()
+
+    # --- CALLS ---
+
+    def submit(self, name, context, args, timeout=None, entry_point="run"):
+        """Returns a concurrent Future with the plugin's (picklable or repr'd) return value."""
+        self.start()
+        return self._callers.submit(self.call, name, context, args, timeout, entry_point)
+
+    def call(self, name, context, args, timeout=None, entry_point="run"):
+        """Blocking version of submit()."""
+        self.start()
+        payload, keep_alive = self._export_context(context)
+        # Waiting for a worker counts against the step timeout: if workers failed
+        # to start or are all stuck, the step fails instead of hanging its thread
+        deadline = None if timeout is None else time.monotonic() + timeout
+        worker = self._acquire(name, deadline)
+        with self._lock:
+            self._busy.add(worker)
+            self.stats["calls"] += 1
+        reply = None
+        try:
+            worker.conn.send(("call", name, entry_point, payload, args))
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if worker.conn.poll(remaining):
+                reply = worker.conn.recv()
+        except (EOFError, OSError):
+            self._replace(worker)
+            raise SandboxError(f"Worker stopped while running {name}")
+        finally:
+            del keep_alive
+
+        if reply is None:
+            with self._lock:
+                self.stats["timeouts"] += 1
+            self._replace(worker)
+            raise TimeoutError(f"{name} exceeded {timeout}s, worker restarted")
+        with self._lock:
+            self._busy.discard(worker)
+        self._idle.put(worker)
+
+        if reply[0] == "error":
+            with self._lock:
+                self.stats["errors"] += 1
+            raise SandboxError(reply[1], reply[2])
+        return reply[1]
+
+    def _acquire(self, name, deadline):
+        while True:
+            wait = 1.0 if deadline is None else min(1.0, deadline - time.monotonic())
+            try:
+                return self._idle.get(timeout=max(0.0, wait))
+            except queue.Empty:
+                pass
+            if not self._running:
+                raise SandboxError(f"Sandbox shut down before {name} could run")
+            with self._lock:
+                no_workers = not self._busy and self._spawn_error is not None
+            if no_workers and self._idle.empty():
+                raise SandboxError(f"No sandbox worker available for {name}: {self._spawn_error}")
+            if deadline is not None and time.monotonic() >= deadline:
+                with self._lock:
+                    self.stats["timeouts"] += 1
+                raise TimeoutError(f"{name}: no sandbox worker free in time")
+
+    def _export_context(self, context):
+        payload = {}
+        for key, value in context.items():
+            if key in ("frame", "frame_handle") or not isinstance(value, _PLAIN_TYPES):
+                continue
+            try:
+                pickle.dumps(value)
+            except Exception:
+                continue
+            payload[key] = value
+
+        handle = context.get("frame_handle")
+        if handle is None and context.get("frame") is not None:
+            from frame_handle import SharedFrame
+            handle = SharedFrame(context["frame"], timestamp=context.get("timestamp"))
+        if handle is not None:
+            shm_name, shape, dtype = handle.shared_memory()
+            payload["__frame__"] = (shm_name, shape, dtype, handle.timestamp, handle.boxes)
+        # The handle owns the shared memory block: keep it alive until the worker replied
+        return payload, handle
+
+    def cancel_all(self):
+        """Kills workers that are mid-step (camera stopped); idle workers are kept."""
+        with self._lock:
+            busy = list(self._busy)
+        for worker in busy:
+            worker.kill()
+
+    def shutdown(self):
+        self._running = False
+        self._callers.shutdown(wait=False, cancel_futures=True)
+        self.cancel_all()
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                worker.conn.send(("stop",))
+            except (EOFError, OSError):
+                pass
+            worker.kill()
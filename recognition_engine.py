@@ -11,13 +11,23 @@
 import cv2
 from deepface import DeepFace
 import os
+import threading
+import numpy as np
 import pandas as pd
 
+# Shared with enroll_faces.py so enrolled embeddings match the live matcher
+MODEL_NAME = 'VGG-Face' # MIT License
+DETECTOR_BACKEND = 'mediapipe'
+
 class FaceEngine:
     def __init__(self, db_path="known_faces"):
         self.db_path = db_path
         if not os.path.exists(db_path):
             os.makedirs(db_path)
+        # One engine serves every camera thread. DeepFace.find() is not thread-safe
+        # (shared detector/model state, it may rewrite the representation file),
+        # so calls are serialised.
+        self._lock = threading.Lock()
 
     def process_frame(self, frame):
         """
@@ -25,15 +35,16 @@ class FaceEngine:
         """
         try:
             # find() returns a list of pandas dataframes
-            results = DeepFace.find(
-                img_path=frame, 
-                db_path=self.db_path, 
-                detector_backend='mediapipe', 
-                enforce_detection=False,
-                model_name='VGG-Face', # MIT License
-                silent=True
-            )
-            
+            with self._lock:
+                results = DeepFace.find(
+                    img_path=frame,
+                    db_path=self.db_path,
+                    detector_backend=DETECTOR_BACKEND,
+                    enforce_detection=False,
+                    model_name=MODEL_NAME,
+                    silent=True
+                )
+
             if len(results) > 0 and not results[0].empty:
                 # The 'identity' column contains the path to the matching image
                 match_path = results[0].iloc[0]['identity']
@@ -41,4 +52,24 @@ class FaceEngine:
                 return name
             return "Unknown"
         except Exception as e:
-            return f"Error: {str(e)}"
\ No newline at end of file
+            return f"Error: {str(e)}"
+
+    def refresh_index(self):
+        """
+        Forces DeepFace to (re)build its representation file for db_path.
+        Call this off the camera thread after adding photos, otherwise the
+        first live find() pays for the rebuild.
+        """
+        blank = np.zeros((64, 64, 3), dtype=np.uint8)
+        try:
+            with self._lock:
+                DeepFace.find(
+                    img_path=blank,
+                    db_path=self.db_path,
+                    detector_backend='skip',
+                    enforce_detection=False,
+                    model_name=MODEL_NAME,
+                    silent=True
+                )
+        except Exception as e:
+            print(f"[FaceEngine] Index refresh failed: {e}")
@@ -13,18 +13,51 @@ import subprocess
 import os
 import sys
 import hashlib
+import struct
+import threading
+import ctypes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives import hashes
 
+SALT = b"THIRDEYE_V1_PROD_SALT"
+
+# --- CHUNKED CONTAINER FORMAT (v1) ---
+# Header (authenticated as AAD on every chunk):
+#   magic(8) | version(1) | chunk_size(u32) | plaintext_size(u64) | chunk_count(u32) | nonce_prefix(8)
+# Then chunk_count records of: ciphertext(len) + GCM tag(16)
+# Chunk nonce = nonce_prefix + chunk index (u32). Chunk AAD = header + index + is_last flag,
+# so chunks cannot be reordered, dropped or truncated without failing authentication.
+CONTAINER_MAGIC = b"TEYECHK\x00"
+CONTAINER_VERSION = 1
+HEADER_FORMAT = ">8sBIQI8s"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+TAG_SIZE = 16
+
+# Key derivation (400k PBKDF2 rounds) runs once per process and is shared
+# by every HardwareGuard and every asset loaded.
+_KEY_CACHE = {}
+_FINGERPRINT = None
+_CACHE_LOCK = threading.Lock()
+
 class HardwareGuard:
-    def __init__(self):
+    def __init__(self, machine_id=None):
         # This generates the ID strictly from the local machine's components.
         # No internet connection or admin dashboard is required.
-        self.machine_id = self._get_hardware_fingerprint()
-        
-        # Salt should be unique to your company/product version
-        self.key = self._derive_key(self.machine_id, salt=b"THIRDEYE_V1_PROD_SALT")
+        # Pass machine_id to encrypt assets for another device (see encrypt_model.py).
+        global _FINGERPRINT
+        with _CACHE_LOCK:
+            if machine_id is None:
+                if _FINGERPRINT is None:
+                    _FINGERPRINT = self._get_hardware_fingerprint()
+                machine_id = _FINGERPRINT
+            self.machine_id = machine_id
+
+            # Salt should be unique to your company/product version
+            if machine_id not in _KEY_CACHE:
+                _KEY_CACHE[machine_id] = self._derive_key(machine_id, salt=SALT)
+            self.key = _KEY_CACHE[machine_id]
 
     def _get_cmd_output(self, cmd):
         try:
@@ -68,13 +101,18 @@ class HardwareGuard:
     def decrypt_to_memory(self, encrypted_path):
         """
         RUNTIME: Decrypts file directly into a RAM byte buffer.
+        Chunked containers are streamed chunk by chunk; legacy single-blob files still load.
         """
         if not os.path.exists(encrypted_path):
             raise FileNotFoundError("License/Model file missing.")
-            
+
         with open(encrypted_path, 'rb') as f:
+            if f.read(len(CONTAINER_MAGIC)) == CONTAINER_MAGIC:
+                f.seek(0)
+                return self._decrypt_chunked(f)
+            f.seek(0)
             file_data = f.read()
-            
+
         nonce = file_data[:12]
         ciphertext = file_data[12:]
         aesgcm = AESGCM(self.key)
@@ -82,4 +120,91 @@ class HardwareGuard:
         try:
             return aesgcm.decrypt(nonce, ciphertext, None)
         except Exception as e:
-            raise PermissionError("HARDWARE ID MISMATCH: Model cannot be loaded on this device.")
\ No newline at end of file
+            raise PermissionError("HARDWARE ID MISMATCH: Model cannot be loaded on this device.")
+
+    def _decrypt_chunked(self, f):
+        header = f.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE:
+            raise PermissionError("Model container is corrupt (short header).")
+        magic, version, chunk_size, plain_size, chunk_count, nonce_prefix = struct.unpack(HEADER_FORMAT, header)
+        if version != CONTAINER_VERSION:
+            raise PermissionError(f"Unsupported model container version {version}.")
+        if chunk_count < 1 or chunk_size < 1 or plain_size > chunk_size * chunk_count:
+            raise PermissionError("Model container is corrupt (bad header).")
+
+        aesgcm = AESGCM(self.key)
+        buffer = bytearray(plain_size)
+        view = memoryview(buffer)
+        # One ciphertext record buffer, reused for every chunk
+        record = bytearray(min(chunk_size, plain_size) + TAG_SIZE)
+        record_view = memoryview(record)
+        decrypt_into = getattr(aesgcm, "decrypt_into", None)  # cryptography >= 44
+        offset = 0
+
+        try:
+            for index in range(chunk_count):
+                is_last = index == chunk_count - 1
+                plain_len = plain_size - offset if is_last else chunk_size
+                if plain_len < 0 or plain_len > chunk_size:
+                    raise ValueError("chunk size mismatch")
+
+                data = record_view[:plain_len + TAG_SIZE]
+                if f.readinto(data) != plain_len + TAG_SIZE:
+                    raise ValueError("truncated container")
+
+                nonce = nonce_prefix + struct.pack(">I", index)
+                aad = header + struct.pack(">IB", index, is_last)
+                # Decrypted straight into the output buffer; a failed tag wipes it below
+                if decrypt_into is not None:
+                    decrypt_into(nonce, data, aad, view[offset:offset + plain_len])
+                else:
+                    view[offset:offset + plain_len] = aesgcm.decrypt(nonce, bytes(data), aad)
+                offset += plain_len
+
+            if offset != plain_size or f.read(1):
+                raise ValueError("trailing data")
+        except Exception:
+            # Never hand out a partially decrypted model
+            _wipe(buffer)
+            raise PermissionError("HARDWARE ID MISMATCH: Model cannot be loaded on this device.")
+        finally:
+            view.release()
+            record_view.release()
+
+        # ort.InferenceSession only accepts 'bytes' (it type-checks, memoryviews are
+        # rejected), so one copy is unavoidable: peak is 2x the model, then 1x
+        model_bytes = bytes(buffer)
+        _wipe(buffer)
+        return model_bytes
+
+    def encrypt_to_file(self, plain_path, encrypted_path, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        BUILD: Writes plain_path as a chunked container bound to this guard's machine ID.
+        Reads and writes one chunk at a time.
+        """
+        plain_size = os.path.getsize(plain_path)
+        chunk_count = max(1, -(-plain_size // chunk_size))
+        nonce_prefix = os.urandom(8)
+        header = struct.pack(HEADER_FORMAT, CONTAINER_MAGIC, CONTAINER_VERSION,
+                             chunk_size, plain_size, chunk_count, nonce_prefix)
+        aesgcm = AESGCM(self.key)
+
+        tmp_path = encrypted_path + ".tmp"
+        with open(plain_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            dst.write(header)
+            for index in range(chunk_count):
+                is_last = index == chunk_count - 1
+                chunk = src.read(chunk_size)
+                nonce = nonce_prefix + struct.pack(">I", index)
+                aad = header + struct.pack(">IB", index, is_last)
+                dst.write(aesgcm.encrypt(nonce, chunk, aad))
+        os.replace(tmp_path, encrypted_path)
+        return encrypted_path
+
+def _wipe(buffer):
+    """Zeroes a bytearray in place, without allocating a second buffer of the same size."""
+    if not buffer:
+        return
+    raw = (ctypes.c_char * len(buffer)).from_buffer(buffer)
+    ctypes.memset(ctypes.addressof(raw), 0, len(buffer))
+    del raw
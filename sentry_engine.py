@@ -5,60 +5,107 @@
 # ----------------------------------------------------------------------------
 import cv2
 import numpy as np
-import onnxruntime as ort
 import os
+import threading
+from session_cache import create_session
+from engine_config import ConfigSnapshot, ConfigSlot
 
 class SentryEngine:
-    def __init__(self, model_path="assets/sentry_model.onnx"):
+    def __init__(self, model_path="assets/sentry_model.onnx", input_size=416):
         """
         Initializes the YOLOX-Nano Neural Engine (Apache 2.0).
         [UPDATE] STRICTLY configured for Human Detection only.
+        Parameters and the session live in an immutable ConfigSnapshot that
+        process_frame() reads once per frame; see update_parameter().
         """
         if not os.path.exists(model_path):
             raise FileNotFoundError(f"Sentry Model not found at {model_path}. Run 'setup_sentry.py' first.")
 
         # Load Neural Network
-        providers = ['CUDAExecutionProvider', 'CPUExecutionProvider']
-        self.session = ort.InferenceSession(model_path, providers=providers)
-        
-        self.input_shape = (416, 416) 
+        self.providers = ['CUDAExecutionProvider', 'CPUExecutionProvider']
         
         self.class_mapping = {
             0: "Person"
         }
 
-        # --- TUNABLE PARAMETERS (Default Values) ---
-        self.conf_thresh = 0.60  # "Sweet spot"
-        self.nms_thresh = 0.45   # Overlap threshold
-        self.score_thresh = 0.3  # Low level cutoff
+        # Grid view calls one engine from up to 16 camera threads. Pre/post-processing
+        # only touches per-call arrays and the frame's config snapshot; the session
+        # run is serialised so cameras don't oversubscribe ONNX Runtime's own threads.
+        self._run_lock = threading.Lock()
+        self._requested = {}       # Runtime changes asked for but not yet published
+        self._request_lock = threading.Lock()
+
+        runtime = self._build_runtime(model_path, input_size, strict=False)
+        self.config = ConfigSlot(ConfigSnapshot(dict(
+            # --- TUNABLE PARAMETERS (Default Values) ---
+            conf_thresh=0.60,   # "Sweet spot"
+            nms_thresh=0.45,    # Overlap threshold
+            score_thresh=0.3,   # Low level cutoff
+            input_size=runtime["_input_shape"][0],
+            model_path=model_path,
+            **runtime
+        )))
+
+    def fork(self):
+        """
+        A second engine on the same loaded session with its own config slot, so
+        tuning one (e.g. the cascade's thresholds) leaves the other untouched.
+        """
+        other = object.__new__(SentryEngine)
+        other.providers = self.providers
+        other.class_mapping = self.class_mapping
+        other._run_lock = self._run_lock  # Same session, same serialisation
+        other._requested = {}
+        other._request_lock = threading.Lock()
+        other.config = ConfigSlot(self.config.current.replace())
+        return other
+
+    def _build_runtime(self, model_path, input_size, strict=True):
+        """Session + decode grids for a model and input size. Slow: runs off the camera thread."""
+        # Reuses the optimised graph from a previous start (plain or .enc models)
+        session = create_session(model_path, self.providers, name="sentry_model")
+        dims = session.get_inputs()[0].shape[2:4]
+        fixed = all(isinstance(d, int) for d in dims)
+        if fixed and tuple(dims) != (input_size, input_size):
+            if strict:
+                raise ValueError(f"{os.path.basename(model_path)} only accepts {dims[0]}x{dims[1]} input")
+            input_size = int(dims[0])
+        input_shape = (input_size, input_size)
 
         # Pre-compute grids for decoding raw YOLOX outputs
-        self.grids = []
-        self.strides = []
+        grids = []
+        strides = []
         for stride in [8, 16, 32]:
-            h, w = self.input_shape[0] // stride, self.input_shape[1] // stride
+            h, w = input_shape[0] // stride, input_shape[1] // stride
             xv, yv = np.meshgrid(np.arange(w), np.arange(h))
             grid = np.stack((xv, yv), 2).reshape(1, -1, 2)
-            self.grids.append(grid)
-            self.strides.append(np.full((1, grid.shape[1], 1), stride))
-            
-        self.grid_coords = np.concatenate(self.grids, axis=1)[0]
-        self.grid_strides = np.concatenate(self.strides, axis=1)[0]
+            grids.append(grid)
+            strides.append(np.full((1, grid.shape[1], 1), stride))
+
+        return {
+            "_session": session,
+            "_input_name": session.get_inputs()[0].name,
+            "_input_shape": input_shape,
+            "_dynamic_input": not fixed,
+            "_grid_coords": np.concatenate(grids, axis=1)[0],
+            "_grid_strides": np.concatenate(strides, axis=1)[0]
+        }
 
     def process_frame(self, frame):
         """
         Returns: list of tuples: ([x, y, w, h], score, label_name)
         """
-        input_tensor, ratio = self._preprocess(frame)
+        # One snapshot for the whole frame: retuning never produces torn reads
+        cfg = self.config.current
+        input_tensor, ratio = self._preprocess(frame, cfg)
         
         # Run AI Inference
-        outputs = self.session.run(None, {self.session.get_inputs()[0].name: input_tensor})[0]
+        with self._run_lock:
+            outputs = cfg._session.run(None, {cfg._input_name: input_tensor})[0]
         
-        # Use instance variables instead of hardcoded values
-        boxes, scores, class_ids = self._postprocess(outputs, ratio, conf_thresh=self.conf_thresh)
+        boxes, scores, class_ids = self._postprocess(outputs, ratio, cfg)
         
-        # Use instance variable for NMS
-        final_boxes, final_scores, final_class_ids = self._nms(boxes, scores, class_ids, iou_thresh=self.nms_thresh)
+        final_boxes, final_scores, final_class_ids = self._nms(boxes, scores, class_ids, cfg)
         
         final_labels = [self.class_mapping.get(cid, "Unknown") for cid in final_class_ids]
         
@@ -69,6 +116,22 @@ class SentryEngine:
         Returns the schema for the UI Model Tuner.
         Format: { internal_var: { label, desc, type, min, max, advanced } }
         """
+        if self.config.current._dynamic_input:
+            input_size = {
+                "label": "Detection Resolution",
+                "desc": "Size the frame is scaled to before detection. Higher finds smaller, farther people but costs more CPU. Applied in the background, the feed keeps running.",
+                "type": "int",
+                "min": 320, "max": 640, "step": 32,
+                "advanced": True
+            }
+        else:
+            # Exported with a fixed input (the shipped YOLOX-Nano is 416x416): show, don't offer
+            input_size = {
+                "label": "Detection Resolution",
+                "desc": "Fixed by this model. Export the model with a dynamic input size to make it adjustable.",
+                "type": "readonly",
+                "advanced": True
+            }
         return {
             "conf_thresh": {
                 "label": "Detection Sensitivity",
@@ -90,22 +153,90 @@ class SentryEngine:
                 "type": "float",
                 "min": 0.1, "max": 0.6, "step": 0.05,
                 "advanced": True
-            }
+            },
+            "input_size": input_size
         }
 
     def update_parameter(self, key, value):
         """Updates a parameter dynamically."""
-        if hasattr(self, key):
-            setattr(self, key, value)
-            print(f"[SentryEngine] Updated {key} to {value}")
+        self.update_parameters({key: value})
+
+    def update_parameters(self, values):
+        """
+        Applies several parameters as one snapshot (e.g. a loaded preset).
+        Thresholds take effect on the next frame; a new input size gets its
+        session built in the background and swapped in when ready.
+        """
+        cfg = self.config.current
+        changes = {k: v for k, v in values.items() if k in cfg.parameters() and k not in ("input_size", "model_path")}
+        if changes:
+            self.config.update(**changes)
+            print(f"[SentryEngine] Updated {changes}")
+
+        size = values.get("input_size")
+        if size is not None:
+            size = max(32, int(round(float(size) / 32)) * 32)
+            with self._request_lock:
+                # Compare with what was last asked for: a pending build may still be on its way
+                latest = self._requested.get("input_size", cfg.input_size)
+            if size == latest:
+                pass
+            elif not cfg._dynamic_input:
+                # Would only build a session to find out it is rejected
+                print(f"[SentryEngine] Input size is fixed at {cfg.input_size}px by this model")
+            else:
+                self._prepare_runtime(input_size=size)
+        if values.get("model_path") not in (None, cfg.model_path):
+            self.swap_model(values["model_path"])
+
+    def swap_model(self, model_path):
+        """Loads another model in the background and switches to it between frames."""
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Sentry Model not found at {model_path}.")
+        self._prepare_runtime(model_path=model_path)
+
+    def _prepare_runtime(self, **requested):
+        with self._request_lock:
+            self._requested.update(requested)
+            changes = dict(self._requested)
+            cfg = self.config.current
+            if all(getattr(cfg, k) == v for k, v in changes.items()):
+                # Back to what is running (e.g. slider dragged away and back): drop the pending build
+                self._requested.clear()
+                self.config.cancel("runtime")
+                return
+
+        def _done(error):
+            with self._request_lock:
+                if self._requested == changes:
+                    self._requested.clear()
+
+        def _build():
+            cfg = self.config.current
+            model_path = changes.get("model_path", cfg.model_path)
+            input_size = changes.get("input_size", cfg.input_size)
+            # A requested size must be honoured; a swapped-in model may bring its own fixed size
+            runtime = self._build_runtime(model_path, input_size, strict="input_size" in changes)
+            input_size = runtime["_input_shape"][0]
+            print(f"[SentryEngine] Switched to {os.path.basename(model_path)} at {input_size}px")
+            return dict(runtime, model_path=model_path, input_size=input_size)
+        self.config.prepare("runtime", _build, on_done=_done)
+
+    def __getattr__(self, key):
+        # ModelTuner reads current values with getattr(); serve them from the snapshot
+        config = self.__dict__.get("config")
+        if config is not None and key in config.current.parameters():
+            return getattr(config.current, key)
+        raise AttributeError(key)
 
-    def _preprocess(self, img):
+    def _preprocess(self, img, cfg):
+        input_shape = cfg._input_shape
         h, w = img.shape[:2]
-        scale = min(self.input_shape[0] / h, self.input_shape[1] / w)
+        scale = min(input_shape[0] / h, input_shape[1] / w)
         nw, nh = int(w * scale), int(h * scale)
         resized_img = cv2.resize(img, (nw, nh))
         
-        padded_img = np.full((self.input_shape[0], self.input_shape[1], 3), 114, dtype=np.uint8)
+        padded_img = np.full((input_shape[0], input_shape[1], 3), 114, dtype=np.uint8)
         padded_img[:nh, :nw] = resized_img
         
         blob = padded_img.astype(np.float32)
@@ -114,15 +245,17 @@ class SentryEngine:
         
         return blob, scale
 
-    def _postprocess(self, outputs, scale, conf_thresh):
+    def _postprocess(self, outputs, scale, cfg):
+        conf_thresh = cfg.conf_thresh
+        grid_coords, grid_strides = cfg._grid_coords, cfg._grid_strides
         predictions = outputs[0]
         boxes = []
         scores = []
         class_ids = []
         
-        if predictions.shape[0] == self.grid_coords.shape[0]:
-            predictions[:, :2] = (predictions[:, :2] + self.grid_coords) * self.grid_strides
-            predictions[:, 2:4] = np.exp(predictions[:, 2:4]) * self.grid_strides
+        if predictions.shape[0] == grid_coords.shape[0]:
+            predictions[:, :2] = (predictions[:, :2] + grid_coords) * grid_strides
+            predictions[:, 2:4] = np.exp(predictions[:, 2:4]) * grid_strides
 
         obj_conf = predictions[:, 4]
         
@@ -159,10 +292,9 @@ class SentryEngine:
             
         return boxes, scores, class_ids
 
-    def _nms(self, boxes, scores, class_ids, iou_thresh):
+    def _nms(self, boxes, scores, class_ids, cfg):
         if not boxes: return [], [], []
-        # Use instance variable score_thresh
-        indices = cv2.dnn.NMSBoxes(boxes, scores, score_threshold=self.score_thresh, nms_threshold=iou_thresh)
+        indices = cv2.dnn.NMSBoxes(boxes, scores, score_threshold=cfg.score_thresh, nms_threshold=cfg.nms_thresh)
         if len(indices) > 0:
             final_boxes = [boxes[i] for i in indices.flatten()]
             final_scores = [scores[i] for i in indices.flatten()]
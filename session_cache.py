@@ -0,0 +1,129 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import os
+import sys
+import glob
+import platform
+import time
+import shutil
+import hashlib
+import tempfile
+import onnxruntime as ort
+
+CACHE_DIR = os.path.join("assets", ".ort_cache")
+
+def _cache_key(model_hash, providers):
+    # Any change in model, runtime or execution providers invalidates the entry.
+    # The CPU is included because fully optimised graphs may use CPU-specific layouts.
+    raw = "|".join([model_hash, ort.__version__, ",".join(providers),
+                    platform.machine(), platform.processor()])
+    return hashlib.sha256(raw.encode()).hexdigest()[:20]
+
+def _hash_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _ram_tmp_dir():
+    """
+    RAM-backed scratch directory for the plaintext optimised graph of an encrypted
+    model, or None where there is none (Windows, macOS): plaintext never goes to disk.
+    """
+    if sys.platform.startswith("linux") and os.path.isdir("/dev/shm"):
+        return tempfile.mkdtemp(prefix="thirdeye_ort_", dir="/dev/shm")
+    return None
+
+def _prune(cache_dir, name, keep):
+    for old in glob.glob(os.path.join(cache_dir, f"{name}_*")):
+        if os.path.basename(old) != keep:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+def create_session(model_path, providers, name=None, cache_dir=CACHE_DIR):
+    """
+    Returns an ort.InferenceSession for model_path, reusing a cached optimised graph.
+
+    First run: the session is created with full optimisation and the optimised graph is
+    saved via optimized_model_filepath. Later runs load that graph with the optimiser off.
+    The cache key covers the model hash, onnxruntime version and provider set.
+    Encrypted models (.enc) are keyed on the ciphertext hash, so a cache hit decrypts
+    only the cached graph, which is stored encrypted with the same HardwareGuard key.
+    Without a RAM-backed temp directory encrypted models are optimised in memory
+    on every start and not cached.
+    """
+    name = name or os.path.splitext(os.path.basename(model_path))[0]
+    encrypted = model_path.endswith(".enc")
+    available = set(ort.get_available_providers())
+    active_providers = [p for p in providers if p in available] or ["CPUExecutionProvider"]
+
+    start = time.time()
+    guard = None
+    if encrypted:
+        from security_core import HardwareGuard
+        guard = HardwareGuard()
+
+    key = _cache_key(_hash_file(model_path), active_providers)
+    cached_name = f"{name}_{key}.onnx" + (".enc" if encrypted else "")
+    cached_path = os.path.join(cache_dir, cached_name)
+
+    # --- CACHE HIT: skip graph optimisation entirely ---
+    if os.path.exists(cached_path):
+        try:
+            opts = ort.SessionOptions()
+            opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            source = guard.decrypt_to_memory(cached_path) if encrypted else cached_path
+            session = ort.InferenceSession(source, sess_options=opts, providers=active_providers)
+            print(f"[SessionCache] {name}: loaded optimised graph in {time.time() - start:.2f}s")
+            return session
+        except Exception as e:
+            print(f"[SessionCache] {name}: cached graph unusable, rebuilding ({e})")
+            try:
+                os.remove(cached_path)
+            except OSError:
+                pass
+
+    # --- CACHE MISS: optimise once and save the result ---
+    opts = ort.SessionOptions()
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if encrypted:
+        # Decrypted chunk by chunk into RAM, never to disk
+        model_bytes = guard.decrypt_to_memory(model_path)
+        tmp_dir = _ram_tmp_dir()
+        if tmp_dir is None:
+            session = ort.InferenceSession(model_bytes, sess_options=opts, providers=active_providers)
+            print(f"[SessionCache] {name}: optimised in {time.time() - start:.2f}s (not cached, no RAM-backed temp dir)")
+            return session
+    else:
+        model_bytes = None
+        tmp_dir = cache_dir
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, f"{name}_{key}.tmp.onnx")
+    opts.optimized_model_filepath = tmp_path
+    session = ort.InferenceSession(model_bytes if encrypted else model_path,
+                                   sess_options=opts, providers=active_providers)
+    del model_bytes
+
+    try:
+        if os.path.exists(tmp_path):
+            if encrypted:
+                guard.encrypt_to_file(tmp_path, cached_path)
+            else:
+                os.replace(tmp_path, cached_path)
+            _prune(cache_dir, name, cached_name)
+    except Exception as e:
+        print(f"[SessionCache] {name}: could not save optimised graph ({e})")
+    finally:
+        if encrypted:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        elif os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    print(f"[SessionCache] {name}: optimised and cached in {time.time() - start:.2f}s")
+    return session
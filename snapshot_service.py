@@ -0,0 +1,210 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import os
+import time
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+def _is_temp(name):
+    # snapshot.jpg.part, clip.mp4.part.mp4 (VideoWriter needs the real extension last)
+    return name.endswith(".part") or ".part." in name
+
+class DiskQuota:
+    def __init__(self, root, max_mb):
+        """
+        Oldest-first size index of the files under root, evicting the oldest
+        once max_mb is exceeded. Shared by snapshots and clips.
+        The existing tree is indexed on a background thread; account() new files.
+        """
+        self.root = root
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._files = deque()   # (path, size)
+        self._total_bytes = 0
+        self._started = time.time()   # Temp files newer than this belong to our own writers
+        self._index_ready = threading.Event()
+        threading.Thread(target=self._build_index, name="quota-index", daemon=True).start()
+
+    def usage(self):
+        return self._total_bytes
+
+    def _build_index(self):
+        found = []
+        if os.path.isdir(self.root):
+            for root, _, files in os.walk(self.root):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    if _is_temp(name):
+                        if st.st_mtime < self._started:
+                            # Left over from a crash mid-write; newer ones are in flight
+                            try:
+                                os.remove(path)
+                            except OSError:
+                                pass
+                        continue
+                    found.append((st.st_mtime, path, st.st_size))
+        found.sort()
+        with self._lock:
+            # Files written while we were scanning are already at the tail
+            known = {p for p, _ in self._files}
+            older = [(p, s) for _, p, s in found if p not in known]
+            self._files.extendleft(reversed(older))
+            self._total_bytes += sum(s for _, s in older)
+        self._index_ready.set()
+        self._evict()
+
+    def account(self, path, size):
+        """Registers a file that just landed under root, then enforces the quota."""
+        with self._lock:
+            self._files.append((path, size))
+            self._total_bytes += size
+        if self._index_ready.is_set():
+            self._evict()
+
+    def _evict(self):
+        if self.max_bytes <= 0:
+            return
+        while True:
+            with self._lock:
+                if self._total_bytes <= self.max_bytes or not self._files:
+                    return
+                path, size = self._files.popleft()
+                self._total_bytes -= size
+            try:
+                os.remove(path)
+                self._prune_empty_dirs(os.path.dirname(path))
+            except OSError:
+                pass
+
+    def _prune_empty_dirs(self, folder):
+        root = os.path.abspath(self.root)
+        folder = os.path.abspath(folder)
+        while folder != root and folder.startswith(root):
+            try:
+                os.rmdir(folder)  # Only succeeds when empty
+            except OSError:
+                return
+            folder = os.path.dirname(folder)
+
+class SnapshotService:
+    def __init__(self, save_dir="snapshots", fmt=".jpg", quality=90, max_mb=2048, workers=2):
+        """
+        Asynchronous snapshot writer shared by plugins and recorders.
+        - Encoding + disk writes run on a small pool (cv2 releases the GIL while encoding).
+        - Files land atomically (temp file + rename) in time-sharded folders:
+              snapshots/YYYY/MM/DD/HH/<prefix>_<HHMMSS>_<ms>_<seq>.jpg
+        - A disk quota (DiskQuota) evicts the oldest snapshots first.
+        """
+        self.save_dir = save_dir
+        self.fmt = fmt if fmt.startswith(".") else f".{fmt}"
+        self.quality = quality
+        self.quota = DiskQuota(save_dir, max_mb)
+
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="snapshot")
+        self._seq = itertools.count()
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    # --- METRICS ---
+
+    def queue_depth(self):
+        """Snapshots accepted but not yet on disk."""
+        return self._pending
+
+    def disk_usage(self):
+        return self.quota.usage()
+
+    # --- PUBLIC API ---
+
+    def submit(self, frame, prefix="snapshot", fmt=None, quality=None, timestamp=None):
+        """
+        Queues a snapshot and returns a Future resolving to the saved path.
+        frame may be an ndarray or a frame_handle.SharedFrame (its memoised
+        encode is reused by other steps).
+        """
+        fmt = fmt or self.fmt
+        quality = self.quality if quality is None else quality
+        timestamp = timestamp or time.time()
+        with self._lock:
+            self._pending += 1
+        return self._pool.submit(self._write, frame, prefix, fmt, quality, timestamp)
+
+    def _write(self, frame, prefix, fmt, quality, timestamp):
+        try:
+            data = self._encode(frame, fmt, quality)
+            path = self._unique_path(prefix, fmt, timestamp)
+
+            tmp = path + ".part"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+            self.quota.account(path, len(data))
+            return path
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _encode(self, frame, fmt, quality):
+        import cv2 # Deferred: keeps OpenCV off the startup path
+        if hasattr(frame, "encode") and hasattr(frame, "array"):
+            return frame.encode(fmt, quality)
+        if fmt in (".jpg", ".jpeg"):
+            params = [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+        elif fmt == ".webp":
+            params = [cv2.IMWRITE_WEBP_QUALITY, int(quality)]
+        else:
+            params = []
+        ok, buf = cv2.imencode(fmt, frame, params)
+        if not ok:
+            raise ValueError(f"Could not encode snapshot as {fmt}")
+        return buf.tobytes()
+
+    def _unique_path(self, prefix, fmt, timestamp):
+        lt = time.localtime(timestamp)
+        folder = os.path.join(self.save_dir, time.strftime("%Y", lt), time.strftime("%m", lt),
+                              time.strftime("%d", lt), time.strftime("%H", lt))
+        os.makedirs(folder, exist_ok=True)
+        ms = int(timestamp * 1000) % 1000
+        # Sequence number keeps bursts within the same millisecond apart
+        name = f"{prefix}_{time.strftime('%H%M%S', lt)}_{ms:03d}_{next(self._seq):06d}{fmt}"
+        return os.path.join(folder, name)
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+# --- DEFAULT SERVICE ---
+# Shared by camera_snapshot and future recorders
+
+_default_service = None
+_default_lock = threading.Lock()
+
+def configure_default_service(**options):
+    global _default_service
+    with _default_lock:
+        if _default_service is not None:
+            _default_service.shutdown(wait=False)
+        _default_service = SnapshotService(**options)
+        return _default_service
+
+def get_default_service():
+    global _default_service
+    with _default_lock:
+        if _default_service is None:
+            _default_service = SnapshotService()
+        return _default_service
+
+def shutdown_default_service():
+    global _default_service
+    with _default_lock:
+        if _default_service is not None:
+            _default_service.shutdown(wait=True)
+            _default_service = None
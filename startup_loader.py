@@ -0,0 +1,109 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+class StartupPipeline:
+    def __init__(self, on_progress=None, max_workers=4):
+        """
+        Dependency-aware startup loader.
+        Stages whose dependencies are done run concurrently on a small thread pool.
+        on_progress(fraction, status_text) is called as stages start and finish.
+        """
+        self.on_progress = on_progress
+        self.max_workers = max_workers
+        self.stages = {}   # { name: {func, deps, label, weight, critical} }
+        self.timings = {}  # { name: (start_offset, duration, ok) }
+        self._lock = threading.Lock()
+
+    def add_stage(self, name, func, deps=(), label=None, weight=1.0, critical=True):
+        """
+        func() runs on a worker thread. Non-critical stages may fail without
+        aborting startup; their dependents still run.
+        """
+        self.stages[name] = {
+            "func": func,
+            "deps": tuple(deps),
+            "label": label or name,
+            "weight": weight,
+            "critical": critical
+        }
+
+    def run(self):
+        """Runs all stages. Raises the first critical stage error."""
+        for name, stage in self.stages.items():
+            for dep in stage["deps"]:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+
+        total_weight = sum(s["weight"] for s in self.stages.values()) or 1.0
+        done_weight = 0.0
+        done = set()
+        running = {}  # { future: name }
+        t0 = time.perf_counter()
+
+        def _timed(name):
+            start = time.perf_counter()
+            try:
+                self.stages[name]["func"]()
+                ok = True
+            except Exception:
+                ok = False
+                raise
+            finally:
+                with self._lock:
+                    self.timings[name] = (start - t0, time.perf_counter() - start, ok)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while len(done) < len(self.stages):
+                # Submit everything that became ready
+                for name, stage in self.stages.items():
+                    if name in done or name in running.values():
+                        continue
+                    if all(dep in done for dep in stage["deps"]):
+                        running[pool.submit(_timed, name)] = name
+
+                if not running:
+                    raise RuntimeError("Startup stages have a dependency cycle.")
+
+                self._report(done_weight / total_weight, running)
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    stage = self.stages[name]
+                    error = future.exception()
+                    if error is not None:
+                        if stage["critical"]:
+                            for f in running:
+                                f.cancel()
+                            self.print_report(time.perf_counter() - t0)
+                            raise error
+                        print(f"[Startup] Non-critical stage '{name}' failed: {error}")
+                    done.add(name)
+                    done_weight += stage["weight"]
+
+        self._report(1.0, {})
+        self.print_report(time.perf_counter() - t0)
+
+    def _report(self, fraction, running):
+        if not self.on_progress:
+            return
+        if running:
+            text = " | ".join(self.stages[n]["label"] for n in running.values())
+        else:
+            text = "Ready!"
+        self.on_progress(fraction, text)
+
+    def print_report(self, wall_time):
+        """Per-stage timing table. Sum vs wall time shows how much ran in parallel."""
+        print("[Startup] Stage timings:")
+        busy = 0.0
+        for name, (offset, duration, ok) in sorted(self.timings.items(), key=lambda kv: kv[1][0]):
+            busy += duration
+            flag = "" if ok else "  FAILED"
+            print(f"    {name:<16} start +{offset:6.2f}s  took {duration:6.2f}s{flag}")
+        print(f"[Startup] Wall time {wall_time:.2f}s (stage time {busy:.2f}s)")
@@ -0,0 +1,132 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+"""
+WebhookClient against a local stand-in HTTP server: batching, retry with
+backoff, and spooling to disk while the endpoint is down.
+Run: python -m pytest tests
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webhook_client import WebhookClient
+
+class _Endpoint:
+    """Records every POST; status_codes are answered in order, then 200."""
+    def __init__(self):
+        self.batches = []
+        self.connections = set()
+        self.status_codes = []
+        self.lock = threading.Lock()
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # Keep-alive, like a real webhook receiver
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                with endpoint.lock:
+                    status = endpoint.status_codes.pop(0) if endpoint.status_codes else 200
+                    endpoint.connections.add(self.client_address)
+                    if status == 200:
+                        endpoint.batches.append(json.loads(body)["events"])
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def events(self):
+        with self.lock:
+            return [e for batch in self.batches for e in batch]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+class WebhookClientTest(unittest.TestCase):
+    def setUp(self):
+        self.endpoint = _Endpoint()
+        self.spool_dir = tempfile.mkdtemp(prefix="webhook_spool_")
+        self.client = None
+
+    def tearDown(self):
+        if self.client is not None:
+            self.client.close()
+        self.endpoint.close()
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+    def _client(self, **options):
+        defaults = dict(url=self.endpoint.url, spool_dir=self.spool_dir, batch_window=0.2,
+                        max_batch=50, backoff=0.05, max_backoff=0.2, timeout=2.0,
+                        workers=1, replay_interval=0.2)
+        defaults.update(options)
+        self.client = WebhookClient(**defaults)
+        return self.client
+
+    def test_batches_events_over_keep_alive(self):
+        # A window long enough that all 120 posts land inside it
+        client = self._client(batch_window=1.0)
+        for i in range(120):
+            self.assertTrue(client.post(self.endpoint.url, {"n": i}))
+
+        self.assertTrue(_wait_for(lambda: len(self.endpoint.events()) == 120))
+        self.assertEqual([e["n"] for e in self.endpoint.events()], list(range(120)))
+        # max_batch caps each POST; the remainder goes out when the window closes
+        self.assertEqual([len(b) for b in self.endpoint.batches], [50, 50, 20])
+        self.assertEqual(len(self.endpoint.connections), 1)
+        self.assertEqual(client.stats["batches"], 3)
+
+    def test_retries_server_errors_with_backoff(self):
+        self.endpoint.status_codes = [503, 500]
+        client = self._client()
+        client.post(self.endpoint.url, {"n": 1})
+
+        self.assertTrue(_wait_for(lambda: self.endpoint.events() == [{"n": 1}]))
+        self.assertEqual(client.stats["retries"], 2)
+        self.assertEqual(client.stats["spooled"], 0)
+
+    def test_does_not_retry_client_errors(self):
+        self.endpoint.status_codes = [400]
+        client = self._client()
+        client.post(self.endpoint.url, {"n": 1})
+
+        self.assertTrue(_wait_for(lambda: client.stats["dropped"] == 1))
+        self.assertEqual(client.stats["retries"], 0)
+
+    def test_spools_while_down_and_replays(self):
+        # Fails every attempt until the endpoint "recovers"
+        self.endpoint.status_codes = [503] * 3
+        client = self._client(max_retries=2)
+        client.post(self.endpoint.url, {"n": 1})
+
+        self.assertTrue(_wait_for(lambda: client.stats["spooled"] == 1 or self.endpoint.events()))
+        # Spooled file is replayed once the host answers, then removed
+        self.assertTrue(_wait_for(lambda: self.endpoint.events() == [{"n": 1}]))
+        self.assertTrue(_wait_for(lambda: not [n for n in os.listdir(self.spool_dir) if n.endswith(".json")]))
+        self.assertEqual(client.stats["spooled"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import time
+import threading
+
+# Per-flow defaults: roughly the old 5 s cooldown, but per camera + identity
+DEFAULT_THROTTLE = {
+    "rate_per_min": 12,       # Sustained triggers per key
+    "burst": 1,               # Triggers allowed back to back before throttling
+    "per_identity": True,     # Separate buckets per identity / track ID
+    "per_camera": True,       # Separate buckets per camera
+    "coalesce": True          # Report how many events were folded into the next trigger
+}
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate_per_sec, capacity):
+        self.rate = rate_per_sec
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self, now):
+        self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+class TriggerThrottle:
+    def __init__(self, idle_expiry=600):
+        """
+        Token-bucket throttling keyed by (model, camera, identity/track).
+        A second person is a new key and fires immediately; a loitering person
+        fires at most rate_per_min times a minute.
+        """
+        self.idle_expiry = idle_expiry
+        self._buckets = {}      # { key: TokenBucket }
+        self._suppressed = {}   # { key: events folded since last trigger }
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self.throttled = 0
+
+    def _key(self, model, camera, identity, config):
+        return (model,
+                camera if config.get("per_camera", True) else None,
+                identity if config.get("per_identity", True) else None)
+
+    def check(self, model, camera, identity, config=None):
+        """
+        Returns (allowed, coalesced_count).
+        coalesced_count is the number of throttled events for this key since its last trigger.
+        """
+        config = {**DEFAULT_THROTTLE, **(config or {})}
+        rate = float(config["rate_per_min"]) / 60.0
+        if rate <= 0:
+            return True, 0
+
+        key = self._key(model, camera, identity, config)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None or bucket.rate != rate or bucket.capacity != max(1, int(config["burst"])):
+                bucket = TokenBucket(rate, max(1, int(config["burst"])))
+                self._buckets[key] = bucket
+
+            if bucket.take(now):
+                folded = self._suppressed.pop(key, 0) if config.get("coalesce", True) else 0
+                allowed = True
+            else:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                self.throttled += 1
+                folded, allowed = 0, False
+
+            if now - self._last_sweep > 60:
+                self._sweep(now)
+        return allowed, folded
+
+    def _sweep(self, now):
+        # Forget keys (identities/tracks) not seen for a while
+        self._last_sweep = now
+        for key in [k for k, b in self._buckets.items() if now - b.updated > self.idle_expiry]:
+            del self._buckets[key]
+            self._suppressed.pop(key, None)
+
+    def reset(self, model=None):
+        with self._lock:
+            if model is None:
+                self._buckets.clear()
+                self._suppressed.clear()
+            else:
+                for key in [k for k in self._buckets if k[0] == model]:
+                    del self._buckets[key]
+                    self._suppressed.pop(key, None)
@@ -0,0 +1,350 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+import os
+import json
+import time
+import heapq
+import queue
+import itertools
+import threading
+import http.client
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+class _HostPool:
+    def __init__(self, scheme, netloc, size, timeout):
+        """Idle keep-alive connections to one host."""
+        self.scheme = scheme
+        self.netloc = netloc
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+
+    def acquire(self):
+        """Returns (connection, reused)."""
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            return cls(self.netloc, timeout=self.timeout), False
+
+    def release(self, conn):
+        if self._idle.qsize() < self.size:
+            self._idle.put(conn)
+        else:
+            conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+class _Batch:
+    __slots__ = ("url", "events", "attempt", "spool_path")
+
+    def __init__(self, url, events, spool_path=None):
+        self.url = url
+        self.events = events
+        self.attempt = 0
+        self.spool_path = spool_path
+
+class WebhookClient:
+    def __init__(self, url=None, spool_dir="user_configs/webhook_spool", batch_window=1.0, max_batch=50,
+                 max_retries=4, backoff=1.0, max_backoff=60.0, timeout=5.0, pool_size=2,
+                 workers=2, spool_max_mb=50, replay_interval=30.0, max_pending=5000, headers=None):
+        """
+        HTTP notifications that never block the caller.
+        - post() only enqueues. Events for the same URL within batch_window seconds
+          (or up to max_batch) go out as one JSON POST: {"events": [...]}.
+        - Each host keeps up to pool_size keep-alive connections.
+        - Failed batches retry with exponential backoff; after max_retries they are
+          written to a bounded on-disk spool and replayed once the host answers again.
+        url: default endpoint for plugins that don't pass one.
+        """
+        self.default_url = url
+        self.spool_dir = spool_dir
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.spool_max_bytes = int(spool_max_mb * 1024 * 1024)
+        self.replay_interval = replay_interval
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.stats = {"queued": 0, "sent": 0, "batches": 0, "retries": 0, "spooled": 0, "dropped": 0}
+
+        self._inbox = queue.Queue(maxsize=max_pending)
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+        self._senders = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="webhook")
+        self._retries = []          # heap of (due, seq, batch)
+        self._retry_lock = threading.Lock()
+        self._seq = itertools.count()
+        self._stop = threading.Event()
+        self._replaying = set()     # Spool files currently being resent
+        self._spool_lock = threading.Lock()
+        os.makedirs(spool_dir, exist_ok=True)
+
+        self._thread = threading.Thread(target=self._dispatch_loop, name="webhook-dispatch", daemon=True)
+        self._thread.start()
+
+    # --- PUBLIC API ---
+
+    def post(self, url, event):
+        """Queues one event for url. Returns False (and counts a drop) if the queue is full."""
+        try:
+            self._inbox.put_nowait((url, event))
+            self.stats["queued"] += 1
+            return True
+        except queue.Full:
+            self.stats["dropped"] += 1
+            return False
+
+    def close(self, timeout=10.0):
+        """Sends what is batched (one attempt), spools the rest, closes connections."""
+        self._stop.set()
+        self._thread.join(timeout)
+        self._senders.shutdown(wait=True)
+        with self._pools_lock:
+            for pool in self._pools.values():
+                pool.close()
+
+    # --- DISPATCHER THREAD ---
+
+    def _dispatch_loop(self):
+        pending = {}        # { url: (deadline, [events]) }
+        next_replay = time.monotonic()
+        while True:
+            now = time.monotonic()
+            wake = [next_replay] + [d for d, _ in pending.values()]
+            with self._retry_lock:
+                if self._retries:
+                    wake.append(self._retries[0][0])
+            try:
+                url, event = self._inbox.get(timeout=max(0.0, min(min(wake) - now, 0.25)))
+                deadline, events = pending.setdefault(url, (time.monotonic() + self.batch_window, []))
+                events.append(event)
+                if len(events) >= self.max_batch:
+                    self._send_async(_Batch(url, pending.pop(url)[1]))
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            stopping = self._stop.is_set()
+            if stopping:
+                # Final drain: everything still waiting gets one attempt
+                try:
+                    while True:
+                        url, event = self._inbox.get_nowait()
+                        pending.setdefault(url, (now, []))[1].append(event)
+                except queue.Empty:
+                    pass
+
+            for url in [u for u, (d, _) in pending.items() if d <= now or stopping]:
+                self._send_async(_Batch(url, pending.pop(url)[1]))
+
+            with self._retry_lock:
+                due = []
+                while self._retries and (self._retries[0][0] <= now or stopping):
+                    due.append(heapq.heappop(self._retries)[2])
+            for batch in due:
+                if stopping:
+                    self._spool(batch)
+                else:
+                    self._send_async(batch)
+
+            if now >= next_replay and not stopping:
+                next_replay = now + self.replay_interval
+                self._replay_spool(limit=5)
+
+            if stopping:
+                return
+
+    def _send_async(self, batch):
+        try:
+            self._senders.submit(self._send, batch)
+        except RuntimeError:
+            # Shutting down: spooled batches are still on disk, new ones go there
+            if batch.spool_path:
+                with self._spool_lock:
+                    self._replaying.discard(batch.spool_path)
+            else:
+                self._spool(batch)
+
+    # --- SENDING (worker threads) ---
+
+    def _pool_for(self, url):
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = _HostPool(parts.scheme, parts.netloc, self.pool_size, self.timeout)
+                self._pools[key] = pool
+        return pool
+
+    def _request(self, url, body):
+        """Returns the HTTP status. Retries once on a fresh connection if a kept-alive one went stale."""
+        pool = self._pool_for(url)
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        for _ in range(2):
+            conn, reused = pool.acquire()
+            try:
+                conn.request("POST", path, body=body, headers=self.headers)
+                response = conn.getresponse()
+                response.read() # Drain so the connection can be reused
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                pool.release(conn)
+            return response.status
+        raise ConnectionError("Connection closed by server")
+
+    def _send(self, batch):
+        body = json.dumps({"events": batch.events}, default=str).encode("utf-8")
+        try:
+            status = self._request(batch.url, body)
+            error = None if 200 <= status < 300 else f"HTTP {status}"
+            retryable = status >= 500 or status == 429
+        except Exception as e:
+            error, retryable = f"{type(e).__name__}: {e}", True
+
+        if error is None:
+            self.stats["sent"] += len(batch.events)
+            self.stats["batches"] += 1
+            if batch.spool_path:
+                self._remove_spooled(batch.spool_path)
+            elif not self._stop.is_set() and self._has_spool():
+                # Host is reachable again: catch up on the backlog
+                self._replay_spool(limit=5)
+            return
+
+        if batch.spool_path:
+            # Stays on disk for the next replay
+            with self._spool_lock:
+                self._replaying.discard(batch.spool_path)
+            return
+        if not retryable:
+            print(f"[WEBHOOK] {batch.url} rejected {len(batch.events)} events: {error}")
+            self.stats["dropped"] += len(batch.events)
+            return
+
+        batch.attempt += 1
+        if batch.attempt > self.max_retries or self._stop.is_set():
+            print(f"[WEBHOOK] {batch.url} unreachable ({error}); spooling {len(batch.events)} events")
+            self._spool(batch)
+            return
+        self.stats["retries"] += 1
+        delay = min(self.max_backoff, self.backoff * (2 ** (batch.attempt - 1)))
+        with self._retry_lock:
+            heapq.heappush(self._retries, (time.monotonic() + delay, next(self._seq), batch))
+
+    # --- SPOOL ---
+
+    def _has_spool(self):
+        try:
+            return any(name.endswith(".json") for name in os.listdir(self.spool_dir))
+        except OSError:
+            return False
+
+    def _spool(self, batch):
+        name = f"{int(time.time() * 1000)}_{next(self._seq):06d}.json"
+        path = os.path.join(self.spool_dir, name)
+        try:
+            with open(path + ".part", "w", encoding="utf-8") as f:
+                json.dump({"url": batch.url, "events": batch.events}, f, default=str)
+            os.replace(path + ".part", path)
+            self.stats["spooled"] += len(batch.events)
+        except OSError as e:
+            print(f"[WEBHOOK] Could not spool events: {e}")
+            self.stats["dropped"] += len(batch.events)
+            return
+        self._trim_spool()
+
+    def _spool_files(self):
+        try:
+            names = sorted(n for n in os.listdir(self.spool_dir) if n.endswith(".json"))
+        except OSError:
+            return []
+        return [os.path.join(self.spool_dir, n) for n in names]
+
+    def _trim_spool(self):
+        # Oldest first: names start with a millisecond timestamp
+        files = [(p, os.path.getsize(p)) for p in self._spool_files() if os.path.exists(p)]
+        total = sum(size for _, size in files)
+        for path, size in files:
+            if total <= self.spool_max_bytes:
+                break
+            self._remove_spooled(path)
+            total -= size
+            print(f"[WEBHOOK] Spool full, discarded {os.path.basename(path)}")
+
+    def _remove_spooled(self, path):
+        with self._spool_lock:
+            self._replaying.discard(path)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _replay_spool(self, limit):
+        for path in self._spool_files():
+            if limit <= 0:
+                return
+            with self._spool_lock:
+                if path in self._replaying:
+                    continue
+                self._replaying.add(path)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                self._remove_spooled(path)
+                continue
+            self._send_async(_Batch(data["url"], data["events"], spool_path=path))
+            limit -= 1
+
+# --- DEFAULT CLIENT ---
+# Shared by the webhook_notify plugin
+
+_default_client = None
+_default_lock = threading.Lock()
+
+def configure_default_client(**options):
+    global _default_client
+    with _default_lock:
+        if _default_client is not None:
+            _default_client.close()
+        _default_client = WebhookClient(**options)
+        return _default_client
+
+def get_default_client():
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = WebhookClient()
+        return _default_client
+
+def close_default_client():
+    global _default_client
+    with _default_lock:
+        if _default_client is not None:
+            _default_client.close()
+            _default_client = None
@@ -0,0 +1,42 @@
+# ----------------------------------------------------------------------------
+#  ThirdEye AI Vision Suite - Proprietary and Confidential
+#  Copyright (c) 2026 Devon Chase. All rights reserved.
+# ----------------------------------------------------------------------------
+"""
+Posts the detection to an HTTP endpoint (batched, retried, spooled when offline).
+Arguments: 'url=http://host:port/path' (optional if set in automation.json)
+"""
+import datetime
+from webhook_client import get_default_client
+
+# Uses the app's webhook batching and spool: must run in-process, never in a sandbox worker
+SANDBOX = False
+
+def _parse_args(args):
+    options = {}
+    for part in args.split():
+        if "=" in part:
+            key, value = part.split("=", 1)
+            options[key.strip()] = value.strip()
+    return options
+
+def run(context, args):
+    client = get_default_client()
+    url = _parse_args(args).get("url") or client.default_url
+    if not url:
+        print("[WEBHOOK] Error: no url= argument and no default webhook url configured.")
+        return
+
+    ts = context.get("timestamp")
+    event = {
+        "ts": ts,
+        "time": datetime.datetime.fromtimestamp(ts).isoformat(timespec="milliseconds") if ts else None,
+        "model": context.get("model"),
+        "identity": context.get("identity"),
+        "score": context.get("score"),
+        "camera": context.get("camera"),
+        "camera_name": context.get("camera_name"),
+        "coalesced": context.get("coalesced", 0)
+    }
+    # Only enqueues: the HTTP round trip happens on the webhook client's threads
+    client.post(url, event)